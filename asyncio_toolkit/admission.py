@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from collections import deque
+from functools import partial, wraps
+
+from .circuit_breaker.coroutine import (
+    circuit_breaker as coroutine_circuit_breaker
+)
+from .deadline import DeadlineExceeded, remaining
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a call is not admitted by an ``AdmissionController``.
+    """
+
+
+class AdmissionController:
+    """
+    Limits how many protected calls run at the same time, queueing the
+    extra ones by priority class and rejecting them before they are
+    served too late.
+
+    Priorities go from 0 (most important) to ``priorities - 1``. Queued
+    calls are admitted by priority first; when the queue is full a new
+    call evicts the newest queued call of a less important class, or is
+    rejected itself.
+
+    The queue is managed CoDel style: while the shortest time spent in
+    the queue during the last ``interval`` seconds stays above
+    ``target_delay`` the controller is overloaded, and then calls wait at
+    most ``target_delay`` seconds and are admitted newest first (adaptive
+    LIFO). Otherwise calls wait up to ``interval`` seconds, oldest first.
+    The deadline of the current context also bounds the wait.
+
+    Rejections raise ``rejection_exception``. When ``breaker`` is given,
+    a coroutine or async/await circuit breaker, each rejection is also
+    counted as one of its failures, without checking its circuit first
+    (rejections still raise ``rejection_exception`` once it opens).
+
+    Example:
+
+        admission = AdmissionController(max_concurrency=20)
+
+        @admission(priority=0)
+        async def checkout(order):
+            ...
+
+        @admission(priority=2)
+        async def recommendations(user):
+            ...
+    """
+
+    def __init__(
+        self,
+        max_concurrency,
+        max_queue=100,
+        priorities=3,
+        target_delay=0.005,
+        interval=0.1,
+        rejection_exception=AdmissionRejected,
+        breaker=None
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.target_delay = target_delay
+        self.interval = interval
+        self.rejection_exception = rejection_exception
+        self.breaker = breaker
+        self.active = 0
+        self.queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.overloaded = False
+        self._queues = [deque() for _ in range(priorities)]
+        self._min_delay = None
+        self._interval_end = None
+
+        if breaker is not None and not isinstance(
+            breaker,
+            coroutine_circuit_breaker
+        ):
+            raise ValueError(
+                'breaker must be a coroutine or async/await circuit breaker'
+            )
+
+    def __call__(self, method=None, priority=0):
+        if method is None:
+            return partial(self, priority=priority)
+
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            await self.acquire(priority)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.release()
+
+        return wrapper
+
+    async def acquire(self, priority=0):
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+
+        if self.active < self.max_concurrency and not self.queue_depth:
+            self._observe_delay(0, now)
+            self._admit()
+            return
+
+        timeout = self.target_delay if self.overloaded else self.interval
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded()
+            timeout = min(timeout, left)
+
+        if self.queue_depth >= self.max_queue and not self._evict(priority):
+            await self._reject(priority, 'queue full')
+
+        waiter = loop.create_future()
+        entry = (waiter, now)
+        queue = self._queues[priority]
+        queue.append(entry)
+        self.queue_depth += 1
+
+        handle = loop.call_later(timeout, self._expire, queue, entry)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                queue.remove(entry)
+                self.queue_depth -= 1
+            elif waiter.result():
+                self.release()
+            raise
+        finally:
+            handle.cancel()
+
+        if not admitted:
+            await self._reject(priority, 'queue timeout')
+
+    def release(self):
+        self.active -= 1
+        now = asyncio.get_event_loop().time()
+
+        while self.active < self.max_concurrency:
+            entry = self._next_entry()
+            if entry is None:
+                return
+
+            waiter, enqueued_at = entry
+            self._observe_delay(now - enqueued_at, now)
+            self.queue_depth -= 1
+            self._admit()
+            waiter.set_result(True)
+
+    def _admit(self):
+        self.active += 1
+        self.admitted += 1
+
+    def _next_entry(self):
+        for queue in self._queues:
+            while queue:
+                entry = queue.pop() if self.overloaded else queue.popleft()
+                if not entry[0].done():
+                    return entry
+        return None
+
+    def _evict(self, priority):
+        for queue in reversed(self._queues[priority + 1:]):
+            while queue:
+                waiter, _ = queue.pop()
+                if not waiter.done():
+                    self.queue_depth -= 1
+                    waiter.set_result(False)
+                    return True
+        return False
+
+    def _expire(self, queue, entry):
+        waiter, enqueued_at = entry
+        if waiter.done():
+            return
+
+        queue.remove(entry)
+        now = asyncio.get_event_loop().time()
+        self._observe_delay(now - enqueued_at, now)
+        self.queue_depth -= 1
+        waiter.set_result(False)
+
+    def _observe_delay(self, delay, now):
+        if self._interval_end is None:
+            self._interval_end = now + self.interval
+
+        if self._min_delay is None or delay < self._min_delay:
+            self._min_delay = delay
+
+        if now >= self._interval_end:
+            overloaded = self._min_delay > self.target_delay
+            if overloaded != self.overloaded:
+                logger.info(
+                    'Admission control overloaded: {}'.format(overloaded)
+                )
+            self.overloaded = overloaded
+            self._min_delay = None
+            self._interval_end = now + self.interval
+
+    async def _reject(self, priority, reason):
+        self.rejected += 1
+        logger.debug(
+            'Call with priority {} rejected: {}'.format(priority, reason)
+        )
+
+        if self.breaker is not None:
+            await self.breaker.count_failure()
+
+        raise self.rejection_exception
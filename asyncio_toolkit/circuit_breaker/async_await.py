@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 class circuit_breaker(coroutine_circuit_breaker):
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -16,5 +18,26 @@ class circuit_breaker(coroutine_circuit_breaker):
     async def open_circuit(self):
         await super().open_circuit()
 
+    async def _backoff_timeout(self):
+        return await super()._backoff_timeout()
+
     async def _check_circuit(self):
         await super()._check_circuit()
+
+    async def record_failure(self):
+        await super().record_failure()
+
+    async def count_failure(self):
+        return await super().count_failure()
+
+    async def _record_failed_result(self):
+        await super()._record_failed_result()
+
+    async def _fall_back(self, exception, args, kwargs):
+        return await super()._fall_back(exception, args, kwargs)
+
+    async def __aenter__(self):
+        return await super().__aenter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await super().__aexit__(exc_type, exc_value, traceback)
@@ -0,0 +1,40 @@
+import math
+import random
+
+MAX_EXPONENT = 64
+
+
+class ExponentialBackoff:
+    """
+    Grows how long a circuit stays open when it keeps tripping again soon
+    after closing.
+
+    The n-th consecutive trip keeps the circuit open for
+    ``circuit_timeout * factor ** (n - 1)`` seconds, capped to
+    ``max_timeout`` and randomized by +/- ``jitter`` (a fraction) so
+    nodes do not probe the dependency in lockstep. Trips are consecutive
+    while the circuit re-opens less than ``reset_after`` seconds after
+    closing; after that long a healthy period the count starts over.
+
+    The trip count is kept on the breaker's storage, so every node
+    sharing it backs off together. Only the node that actually opens the
+    circuit counts the trip, which requires a storage supporting ``add``.
+    """
+
+    def __init__(self, factor=2, max_timeout=600, jitter=0.1, reset_after=60):
+        self.factor = factor
+        self.max_timeout = max_timeout
+        self.jitter = jitter
+        self.reset_after = reset_after
+
+    def timeout(self, circuit_timeout, trips):
+        exponent = min(max(trips - 1, 0), MAX_EXPONENT)
+        timeout = min(circuit_timeout * self.factor ** exponent, self.max_timeout)
+
+        if self.jitter:
+            timeout *= 1 + random.uniform(-self.jitter, self.jitter)
+
+        return max(int(math.ceil(min(timeout, self.max_timeout))), 1)
+
+    def trips_timeout(self, timeout):
+        return int(math.ceil(timeout + self.reset_after))
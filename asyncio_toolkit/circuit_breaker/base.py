@@ -1,5 +1,11 @@
 import abc
 import logging
+import random
+import time
+
+from .classifier import ExceptionClassifier
+from .fallback import LastKnownGood
+from .ramp import linear
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +17,71 @@ class BaseCircuitBreaker(metaclass=abc.ABCMeta):
     the other modules inside this package are strongly dependent on
     which kind of asynchronous model your
     code is running with (async/await or coroutines).
+
+    ``fallback`` is used by the decorator forms when a call is rejected
+    or fails with a catchable exception: either a ``LastKnownGood``
+    instance or a callable receiving the exception followed by the call
+    arguments, whose return value is used as the call result.
+
+    ``shed_when`` is an optional predicate checked before every call;
+    while it returns True calls are rejected with ``max_failure_exception``
+    without reaching the storage or counting as failures (see
+    ``asyncio_toolkit.loop_monitor.LoopLagMonitor.lagging``).
+
+    When ``ramp_period`` is set, an instance that has seen its circuit
+    open admits only a growing fraction of calls, given by
+    ``ramp_strategy`` (see ``ramp``), during ``ramp_period`` seconds after
+    the circuit closes. The other calls are rejected as if the circuit
+    was open, and any failure during the ramp opens it again.
+
+    Async generator functions are protected as streams: the circuit is
+    checked when the stream starts and, if ``stream_check_every`` is set,
+    again after every that many chunks, closing the stream as soon as the
+    circuit is found open. A failure while producing a chunk is counted
+    once and ends the stream. ``fallback`` is not supported for streams
+    (decorating one raises ValueError), and like coroutine functions they
+    never run on ``executor``.
+
+    When ``executor`` is set, regular (blocking) functions can be
+    protected too: they run on that executor, while the circuit checks
+    and the failure accounting stay on the event loop, so no thread is
+    taken by a call rejected with the circuit open (see
+    ``asyncio_toolkit.executor.BoundedExecutor``).
+
+    Which exceptions count as failures is decided by ``classifier``. The
+    default one matches the exact types in ``catch_exceptions``; give an
+    ``ExceptionClassifier`` to match subclasses, exclude types or count
+    some results as failures.
+
+    With ``backoff`` (see ``backoff.ExponentialBackoff``) the circuit stays
+    open longer every time it trips again soon after closing, starting
+    from ``circuit_timeout``. It requires a storage with an ``add``
+    method, adding a key only if it does not exist yet.
     """
 
+    __slots__ = (
+        'storage',
+        'failure_key',
+        'max_failure_timeout',
+        'circuit_timeout',
+        'circuit_key',
+        'max_failure_exception',
+        'catch_exceptions',
+        'max_failures',
+        'min_deadline_remaining',
+        'fallback',
+        'shed_when',
+        'ramp_period',
+        'ramp_strategy',
+        'stream_check_every',
+        'executor',
+        'classifier',
+        'backoff',
+        'trips_key',
+        '_was_open',
+        '_ramp_started_at',
+    )
+
     def __init__(
         self,
         storage,
@@ -21,16 +90,45 @@ class BaseCircuitBreaker(metaclass=abc.ABCMeta):
         max_failure_exception,
         max_failure_timeout=None,
         circuit_timeout=None,
-        catch_exceptions=None
+        catch_exceptions=None,
+        min_deadline_remaining=0,
+        fallback=None,
+        shed_when=None,
+        ramp_period=None,
+        ramp_strategy=linear,
+        stream_check_every=None,
+        executor=None,
+        classifier=None,
+        backoff=None
     ):
         self.storage = storage
         self.failure_key = failure_key
         self.max_failure_timeout = max_failure_timeout
         self.circuit_timeout = circuit_timeout
         self.circuit_key = 'circuit_{}'.format(failure_key)
+        self.trips_key = 'trips_{}'.format(failure_key)
         self.max_failure_exception = max_failure_exception
         self.catch_exceptions = catch_exceptions or (Exception,)
         self.max_failures = max_failures
+        self.min_deadline_remaining = min_deadline_remaining
+        self.fallback = fallback
+        self.shed_when = shed_when
+        self.ramp_period = ramp_period
+        self.ramp_strategy = ramp_strategy
+        self.stream_check_every = stream_check_every
+        self.executor = executor
+        self.classifier = classifier or ExceptionClassifier(
+            self.catch_exceptions,
+            subclasses=False
+        )
+        self.backoff = backoff
+        self._was_open = False
+        self._ramp_started_at = None
+
+        if backoff is not None and circuit_timeout is None:
+            raise ValueError('backoff requires a circuit_timeout')
+        if backoff is not None and not callable(getattr(storage, 'add', None)):
+            raise ValueError('backoff requires a storage supporting add')
 
     @abc.abstractmethod
     def increment(self):
@@ -54,21 +152,95 @@ class BaseCircuitBreaker(metaclass=abc.ABCMeta):
         on the storage engine, and also, setting a TTL to it.
         """
 
+    def release(self):
+        """
+        Drops any state this instance keeps in process memory. Shared state
+        on the storage engine is left untouched.
+        """
+        if isinstance(self.fallback, LastKnownGood):
+            self.fallback.discard(self.failure_key)
+        self._was_open = False
+        self._ramp_started_at = None
+
     def _is_catchable(self, exception):
-        is_catchable = any(
-            exc in self.catch_exceptions
-            for exc in [type(exception), exception]
-        )
+        return self.classifier(exception)
 
-        logger.debug('Testing if {} is catcheable:{}'.format(
-            type(exception),
-            is_catchable
-        ))
+    def is_openess_error(self, exception):
+        """
+        Tells whether ``exception`` is the one raised by this instance
+        to reject a call while the circuit is open.
+        """
+        expected = self.max_failure_exception
+        if expected is None:
+            return False
+        if not isinstance(expected, type):
+            return exception is expected
+        return isinstance(exception, expected)
+
+    def _open_circuit_timeouts(self, trips):
+        """
+        Returns how long the circuit must stay open for its ``trips``-th
+        consecutive trip, and how long that trip count must be kept.
+        """
+        timeout = self.backoff.timeout(self.circuit_timeout, trips)
+        return timeout, self.backoff.trips_timeout(timeout)
+
+    def _now(self):
+        return time.monotonic()
+
+    def _track_circuit(self, is_open):
+        if self.ramp_period is None:
+            return
+
+        if is_open:
+            self._was_open = True
+            self._ramp_started_at = None
+        elif self._was_open:
+            self._was_open = False
+            self._ramp_started_at = self._now()
+
+            logger.info(
+                'Ramping up traffic for: {}'.format(self.failure_key)
+            )
 
-        return is_catchable
+    def _check_ramp(self):
+        if self._ramp_started_at is None:
+            return
+
+        progress = (self._now() - self._ramp_started_at) / self.ramp_period
+        if progress >= 1:
+            self._ramp_started_at = None
+            return
+
+        if random.random() >= self.ramp_strategy(progress):
+            self._raise_openess()
+
+    def _shed_load(self):
+        if self.shed_when is not None and self.shed_when():
+            logger.debug('Shedding load for: {}'.format(self.failure_key))
+            self._raise_openess()
+
+    def _should_fall_back(self, exception):
+        return self.is_openess_error(exception) or self._is_catchable(exception)
+
+    def _fallback_result(self, exception, args, kwargs):
+        if isinstance(self.fallback, LastKnownGood):
+            return self.fallback.get(self.failure_key, args, kwargs, exception)
+        return self.fallback(exception, *args, **kwargs)
+
+    def _record_success(self, args, kwargs, result):
+        if self.classifier.is_failure_result(result):
+            return
+        if isinstance(self.fallback, LastKnownGood):
+            self.fallback.record(self.failure_key, args, kwargs, result)
 
     def _exceeded_max_failures(self, total_failures):
         return total_failures >= self.max_failures
 
+    def _should_open_circuit(self, total_failures):
+        if self._ramp_started_at is not None:
+            return True
+        return self._exceeded_max_failures(total_failures)
+
     def _raise_openess(self):
         raise self.max_failure_exception
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExceptionClassifier:
+    """
+    Decides which outcomes of a protected call count as failures.
+
+    An exception is a failure when its type is one of ``catch`` and not
+    one of ``exclude``, including subclasses unless ``subclasses`` is
+    False. Decisions are memoized per exception type, so classifying is a
+    single dict lookup once a type has been seen. Cancellations are never
+    failures.
+
+    ``result_predicate``, when given, receives the value returned by a
+    successful call and returns True to count it as a failure anyway,
+    without raising.
+
+    Example:
+
+        classifier = ExceptionClassifier(
+            catch=(aiohttp.ClientError, asyncio.TimeoutError),
+            exclude=(aiohttp.ClientResponseError,),
+            result_predicate=lambda response: response.status >= 500,
+        )
+    """
+
+    def __init__(
+        self,
+        catch=(Exception,),
+        exclude=(),
+        result_predicate=None,
+        subclasses=True
+    ):
+        self.catch = tuple(catch)
+        self.exclude = tuple(exclude)
+        self.result_predicate = result_predicate
+        self.subclasses = subclasses
+        self._decisions = {}
+
+    def __call__(self, exception):
+        if isinstance(exception, type):
+            exception_type = exception
+        else:
+            exception_type = type(exception)
+
+        try:
+            return self._decisions[exception_type]
+        except KeyError:
+            pass
+
+        decision = self._decisions[exception_type] = self._classify(
+            exception_type
+        )
+
+        logger.debug('Testing if {} is catcheable:{}'.format(
+            exception_type,
+            decision
+        ))
+
+        return decision
+
+    def is_failure_result(self, result):
+        if self.result_predicate is None:
+            return False
+        return bool(self.result_predicate(result))
+
+    def _classify(self, exception_type):
+        if issubclass(exception_type, asyncio.CancelledError):
+            return False
+
+        if not self.subclasses:
+            if exception_type in self.exclude:
+                return False
+            return exception_type in self.catch
+
+        if issubclass(exception_type, self.exclude):
+            return False
+        return issubclass(exception_type, self.catch)
@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 class CircuitBreaker(BaseCircuitBreaker):
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -46,19 +48,46 @@ class CircuitBreaker(BaseCircuitBreaker):
         return self.storage.get(self.circuit_key) or False
 
     def open_circuit(self):
+        timeout = self.circuit_timeout
+        if self.backoff is not None:
+            timeout = self._backoff_timeout()
+            if timeout is None:
+                self._track_circuit(True)
+                return
+
         self.storage.set(
             self.circuit_key,
             1,
-            self.circuit_timeout
+            timeout
         )
+        self._track_circuit(True)
+
+    def _backoff_timeout(self):
+        """
+        Opens the circuit only if no other node did it already, so a trip
+        is counted once however many nodes cross ``max_failures``, and
+        returns how long it must stay open. Returns None when the circuit
+        was already open.
+        """
+        if not self.storage.add(self.circuit_key, 1, self.circuit_timeout):
+            return None
+
+        trips = self.storage.increment(self.trips_key)
+        timeout, trips_timeout = self._open_circuit_timeouts(trips)
+        self.storage.expire(self.trips_key, trips_timeout)
+        return timeout
 
     def __enter__(self):
+        self._shed_load()
         self._check_circuit()
+        self._check_ramp()
 
         return self
 
     def _check_circuit(self):
-        if self.is_circuit_open:
+        is_open = self.is_circuit_open
+        self._track_circuit(is_open)
+        if is_open:
             self._raise_openess()
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -67,7 +96,7 @@ class CircuitBreaker(BaseCircuitBreaker):
 
             total_failures = self.increment()
 
-            if self._exceeded_max_failures(total_failures):
+            if self._should_open_circuit(total_failures):
                 self.open_circuit()
 
                 logger.info(
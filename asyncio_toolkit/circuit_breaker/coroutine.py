@@ -1,7 +1,14 @@
 import asyncio
+import inspect
 import logging
-from functools import wraps
+from functools import partial, wraps
 
+from ..deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    current_task,
+    wait_within_deadline
+)
 from .base import BaseCircuitBreaker
 
 logger = logging.getLogger(__name__)
@@ -9,8 +16,11 @@ logger = logging.getLogger(__name__)
 
 class circuit_breaker(BaseCircuitBreaker):
 
+    __slots__ = ('_deadline_timers',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._deadline_timers = {}
 
     @asyncio.coroutine
     def increment(self):
@@ -51,48 +61,285 @@ class circuit_breaker(BaseCircuitBreaker):
 
     @asyncio.coroutine
     def open_circuit(self):
-        yield from self.storage.set(self.circuit_key, 1, self.circuit_timeout)
+        timeout = self.circuit_timeout
+        if self.backoff is not None:
+            timeout = yield from self._backoff_timeout()
+            if timeout is None:
+                self._track_circuit(True)
+                return
+
+        yield from self.storage.set(self.circuit_key, 1, timeout)
         yield from self.storage.delete(self.failure_key)
+        self._track_circuit(True)
 
         logger.critical(
-            'Open circuit for {failure_key} {cicuit_storage_key}'.format(
+            'Open circuit for {failure_key} {cicuit_storage_key} '
+            '- timeout {timeout}'.format(
                 failure_key=self.failure_key,
-                cicuit_storage_key=self.circuit_key
+                cicuit_storage_key=self.circuit_key,
+                timeout=timeout
             )
         )
 
+    @asyncio.coroutine
+    def _backoff_timeout(self):
+        """
+        Opens the circuit only if no other node did it already, so a trip
+        is counted once however many nodes cross ``max_failures``, and
+        returns how long it must stay open. Returns None when the circuit
+        was already open.
+        """
+        try:
+            yield from self.storage.add(
+                self.circuit_key,
+                1,
+                self.circuit_timeout
+            )
+        except ValueError:
+            logger.debug(
+                'Circuit already open for: {}'.format(self.failure_key)
+            )
+            return None
+
+        trips = yield from self.storage.increment(self.trips_key, 1)
+        timeout, trips_timeout = self._open_circuit_timeouts(trips)
+        yield from self.storage.expire(self.trips_key, trips_timeout)
+        return timeout
+
+    def _now(self):
+        return asyncio.get_event_loop().time()
+
     @asyncio.coroutine
     def _check_circuit(self):
         is_open = yield from self.is_circuit_open
+        self._track_circuit(is_open)
         if is_open:
             self._raise_openess()
 
+    @asyncio.coroutine
+    def record_failure(self):
+        """
+        Counts one failure and opens the circuit when the limit is
+        reached or the traffic is still ramping up, raising
+        ``max_failure_exception`` in that case.
+        """
+        yield from self._check_circuit()
+
+        opened = yield from self.count_failure()
+        if opened:
+            raise self.max_failure_exception
+
+    @asyncio.coroutine
+    def count_failure(self):
+        """
+        Counts one failure without checking the circuit first, opening it
+        when the limit is reached or the traffic is still ramping up.
+        Returns whether the circuit was opened.
+        """
+        total_failures = yield from self.increment()
+
+        if not self._should_open_circuit(total_failures):
+            return False
+
+        yield from self.open_circuit()
+
+        logger.info(
+            'Max failures exceeded by: {}'.format(
+                self.failure_key
+            )
+        )
+
+        return True
+
+    @asyncio.coroutine
+    def _record_failed_result(self):
+        try:
+            yield from self.record_failure()
+        except Exception as e:
+            if not self.is_openess_error(e):
+                raise e
+
+    @asyncio.coroutine
+    def _fall_back(self, exception, args, kwargs):
+        result = self._fallback_result(exception, args, kwargs)
+        if inspect.isawaitable(result):
+            result = yield from result
+        return result
+
+    @asyncio.coroutine
+    def __aenter__(self):
+        """
+        When a deadline is set the block is cancelled once it is reached,
+        raising ``DeadlineExceeded`` as the decorator does.
+        """
+        left = check_deadline(self.min_deadline_remaining)
+        self._shed_load()
+        yield from self._check_circuit()
+        self._check_ramp()
+
+        if left is not None:
+            self._start_deadline_timer(left)
+
+        return self
+
+    @asyncio.coroutine
+    def __aexit__(self, exc_type, exc_value, traceback):
+        deadline_reached = self._stop_deadline_timer()
+
+        if exc_type is asyncio.CancelledError:
+            if not deadline_reached:
+                return
+            exc_value = DeadlineExceeded()
+
+        if exc_value is not None and self._is_catchable(exc_value):
+            yield from self.record_failure()
+
+        if exc_type is asyncio.CancelledError:
+            raise exc_value
+
+    def _start_deadline_timer(self, left):
+        task = current_task()
+        if task is None:
+            return
+
+        timer = asyncio.get_event_loop().call_later(left, task.cancel)
+        self._deadline_timers.setdefault(task, []).append(timer)
+
+    def _stop_deadline_timer(self):
+        """
+        Cancels the deadline timer of the innermost block of the current
+        task, returning whether it was reached.
+        """
+        task = current_task()
+        timers = self._deadline_timers.get(task)
+        if not timers:
+            return False
+
+        timer = timers.pop()
+        if not timers:
+            del self._deadline_timers[task]
+
+        timer.cancel()
+        return timer.when() <= asyncio.get_event_loop().time()
+
     def __call__(self, method):
+        if inspect.isasyncgenfunction(method):
+            if self.fallback is not None:
+                raise ValueError(
+                    'fallback is not supported for async generators'
+                )
+            return self._protect_stream(method)
+
+        if self.executor is not None and not self._is_coroutine(method):
+            method = self._run_in_executor(method)
+
+        wrapper = self._protect(method)
+
+        if self.fallback is None:
+            return wrapper
+        return self._protect_with_fallback(method, wrapper)
+
+    @staticmethod
+    def _is_coroutine(method):
+        if asyncio.iscoroutinefunction(method):
+            return True
+        return inspect.isgeneratorfunction(method)
+
+    def _run_in_executor(self, method):
+        @asyncio.coroutine
+        @wraps(method)
+        def run(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            return (yield from loop.run_in_executor(
+                self.executor,
+                partial(method, *args, **kwargs)
+            ))
+
+        return run
+
+    def _protect(self, method):
         @asyncio.coroutine
         @wraps(method)
         def wrapper(*args, **kwargs):
+            left = check_deadline(self.min_deadline_remaining)
+            self._shed_load()
             yield from self._check_circuit()
+            self._check_ramp()
 
             try:
-                return (yield from method(*args, **kwargs))
+                if left is None:
+                    result = yield from method(*args, **kwargs)
+                else:
+                    result = yield from wait_within_deadline(
+                        method(*args, **kwargs)
+                    )
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 if self._is_catchable(e):
-                    yield from self._check_circuit()
-
-                    total_failures = yield from self.increment()
+                    yield from self.record_failure()
+                raise e
 
-                    if self._exceeded_max_failures(total_failures):
-                        yield from self.open_circuit()
+            if self.classifier.is_failure_result(result):
+                yield from self._record_failed_result()
+            return result
 
-                        logger.info(
-                            'Max failures exceeded by: {}'.format(
-                                self.failure_key
-                            )
-                        )
+        return wrapper
 
-                        raise self.max_failure_exception
-                    raise e
-                else:
+    def _protect_with_fallback(self, method, wrapper):
+        @asyncio.coroutine
+        @wraps(method)
+        def fallback_wrapper(*args, **kwargs):
+            try:
+                result = yield from wrapper(*args, **kwargs)
+            except Exception as e:
+                if not self._should_fall_back(e):
                     raise e
+                return (yield from self._fall_back(e, args, kwargs))
+
+            self._record_success(args, kwargs, result)
+            return result
+
+        return fallback_wrapper
+
+    def _protect_stream(self, method):
+        # Async generators can only be driven from native coroutines,
+        # hence async/await instead of the generator based style above.
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            left = check_deadline(self.min_deadline_remaining)
+            self._shed_load()
+            await self._check_circuit()
+            self._check_ramp()
+
+            stream = method(*args, **kwargs)
+            check_every = self.stream_check_every
+            chunks = 0
+            try:
+                while True:
+                    try:
+                        chunk = await self._next_chunk(stream, left)
+                    except StopAsyncIteration:
+                        return
+
+                    yield chunk
+
+                    chunks += 1
+                    if check_every and not chunks % check_every:
+                        await self._check_circuit()
+            finally:
+                await stream.aclose()
 
         return wrapper
+
+    async def _next_chunk(self, stream, left):
+        try:
+            if left is None:
+                return await stream.__anext__()
+            return await wait_within_deadline(stream.__anext__())
+        except (asyncio.CancelledError, StopAsyncIteration):
+            raise
+        except Exception as e:
+            if self._is_catchable(e):
+                await self.record_failure()
+            raise e
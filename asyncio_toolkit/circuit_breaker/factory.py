@@ -0,0 +1,96 @@
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerFactory:
+    """
+    Keeps one shared circuit breaker per failure key, for keys that are
+    only known at request time (tenants, upstream hosts...).
+
+    Breakers live in a bounded LRU: when ``maxsize`` is reached the least
+    recently used key is evicted, and keys not requested for more than
+    ``idle_timeout`` seconds are evicted as well. Evicted breakers have
+    their local state released. Every other keyword argument is passed
+    to ``breaker_class`` when a breaker is created.
+
+    Example:
+
+        breakers = CircuitBreakerFactory(
+            circuit_breaker,
+            maxsize=1024,
+            storage=cache,
+            max_failures=10,
+            max_failure_exception=UpstreamUnavailable,
+        )
+
+        async with breakers.get('upstream_{}'.format(host)):
+            ...
+    """
+
+    def __init__(
+        self,
+        breaker_class,
+        maxsize=128,
+        idle_timeout=None,
+        **breaker_kwargs
+    ):
+        self.breaker_class = breaker_class
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers = OrderedDict()
+
+    def get(self, failure_key):
+        now = time.monotonic()
+        entry = self._breakers.get(failure_key)
+
+        if entry is None:
+            entry = [
+                self.breaker_class(
+                    failure_key=failure_key,
+                    **self.breaker_kwargs
+                ),
+                now
+            ]
+            self._breakers[failure_key] = entry
+            self._evict(now)
+        else:
+            entry[1] = now
+            self._breakers.move_to_end(failure_key)
+
+        return entry[0]
+
+    __getitem__ = get
+
+    def __contains__(self, failure_key):
+        return failure_key in self._breakers
+
+    def __len__(self):
+        return len(self._breakers)
+
+    def clear(self):
+        while self._breakers:
+            _, (breaker, _) = self._breakers.popitem(last=False)
+            breaker.release()
+
+    def _evict(self, now):
+        while len(self._breakers) > self.maxsize:
+            self._pop_oldest()
+
+        if self.idle_timeout is None:
+            return
+
+        while self._breakers:
+            _, last_used = next(iter(self._breakers.values()))
+            if now - last_used <= self.idle_timeout:
+                break
+            self._pop_oldest()
+
+    def _pop_oldest(self):
+        failure_key, (breaker, _) = self._breakers.popitem(last=False)
+        breaker.release()
+
+        logger.debug('Evicted circuit breaker for: {}'.format(failure_key))
@@ -0,0 +1,80 @@
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LastKnownGood:
+    """
+    Fallback that serves the last successful result of a protected call
+    for the same arguments, while it is younger than ``ttl`` seconds.
+    At most ``maxsize`` results are kept, least recently used first out.
+
+    When there is no result to serve (unknown or unhashable arguments,
+    or an expired result) the original exception is raised.
+
+    Example:
+
+        @circuit_breaker(
+            ...,
+            fallback=LastKnownGood(maxsize=1000, ttl=300),
+        )
+        async def get_product(sku):
+            ...
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._results = OrderedDict()
+
+    def record(self, failure_key, args, kwargs, result):
+        key = self._make_key(failure_key, args, kwargs)
+        if key is None:
+            return
+
+        self._results[key] = (result, time.monotonic() + self.ttl)
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def get(self, failure_key, args, kwargs, exception):
+        key = self._make_key(failure_key, args, kwargs)
+        entry = self._results.get(key) if key is not None else None
+
+        if entry is None:
+            raise exception
+
+        result, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._results[key]
+            raise exception
+
+        self._results.move_to_end(key)
+
+        logger.debug(
+            'Serving last known good result for: {}'.format(failure_key)
+        )
+
+        return result
+
+    def discard(self, failure_key):
+        for key in [key for key in self._results if key[0] == failure_key]:
+            del self._results[key]
+
+    def clear(self):
+        self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+    @staticmethod
+    def _make_key(failure_key, args, kwargs):
+        key = (failure_key, args, frozenset(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
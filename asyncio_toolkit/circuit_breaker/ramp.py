@@ -0,0 +1,15 @@
+"""
+Ramp up strategies for the slow start after a circuit closes.
+Each one maps the progress of the ramp period, from 0 to 1, to the
+fraction of calls that should be admitted.
+"""
+
+MIN_FRACTION = 0.01
+
+
+def linear(progress):
+    return max(progress, MIN_FRACTION)
+
+
+def exponential(progress):
+    return MIN_FRACTION ** (1 - progress)
@@ -53,6 +53,12 @@ class MemoryStorage(CircuitBreakerBaseStorage):
     def set(self, key, value, timeout):
         self._cache.set(key, value, timeout)
 
+    def add(self, key, value, timeout):
+        # SimpleCache.add refuses keys that expired but were not pruned yet
+        if not self._cache.has(key):
+            self._cache.delete(key)
+        return self._cache.add(key, value, timeout)
+
     def expire(self, key, timeout):
         if timeout:
             self._timeout[key] = time.time() + timeout
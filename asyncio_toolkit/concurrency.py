@@ -0,0 +1,120 @@
+import asyncio
+import inspect
+import logging
+from collections import namedtuple
+from functools import partial
+from itertools import islice
+
+from .deadline import DeadlineExceeded, remaining
+
+logger = logging.getLogger(__name__)
+
+
+Outcome = namedtuple('Outcome', ['index', 'result', 'exception'])
+
+
+def _rejection(breaker):
+    exception = breaker.max_failure_exception
+    if isinstance(exception, type):
+        return exception()
+    return exception
+
+
+def _outcome(task, index):
+    if task.cancelled():
+        return Outcome(index, None, asyncio.CancelledError())
+
+    exception = task.exception()
+    if exception is None:
+        return Outcome(index, task.result(), None)
+    return Outcome(index, None, exception)
+
+
+def _deadline_exceeded():
+    left = remaining()
+    return left is not None and left <= 0
+
+
+async def _circuit_opened(breaker, exception):
+    if breaker is None or not breaker.is_openess_error(exception):
+        return False
+
+    # Traffic ramps and load shedding reject calls with the same
+    # exception while the circuit is still closed.
+    is_open = breaker.is_circuit_open
+    if inspect.isawaitable(is_open):
+        is_open = await is_open
+    return bool(is_open)
+
+
+def _schedule(coro_function, items, pending, limit):
+    for index, item in islice(items, limit - len(pending)):
+        pending[asyncio.ensure_future(coro_function(item))] = index
+
+
+def bounded_map(coro_function, iterable, limit, breaker=None):
+    """
+    Calls ``coro_function`` for every item of ``iterable`` keeping at most
+    ``limit`` calls in flight, and yields an ``Outcome`` for each item as
+    soon as it completes (not in input order).
+
+    When ``breaker`` is given and any call is rejected by it because its
+    circuit is open (checked on the storage, as ramp and load shedding
+    rejections raise the same exception), no new call is scheduled: every
+    item left is yielded right away with the breaker's
+    ``max_failure_exception``, without creating a task or reading the
+    storage. Calls already in flight are left to finish. The same happens,
+    with ``DeadlineExceeded``, once the deadline of the current context
+    (see ``asyncio_toolkit.deadline``) is reached.
+
+    Example:
+
+        async for outcome in bounded_map(fetch, urls, 50, breaker=breaker):
+            if outcome.exception is None:
+                results[outcome.index] = outcome.result
+    """
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return _bounded_map(coro_function, iterable, limit, breaker)
+
+
+async def _bounded_map(coro_function, iterable, limit, breaker):
+    items = enumerate(iterable)
+    pending = {}
+    rejection = None
+
+    try:
+        while True:
+            if rejection is None and _deadline_exceeded():
+                rejection = DeadlineExceeded
+
+            if rejection is None:
+                _schedule(coro_function, items, pending, limit)
+            else:
+                for index, _ in items:
+                    yield Outcome(index, None, rejection())
+
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                outcome = _outcome(task, pending.pop(task))
+
+                if rejection is None and (
+                    await _circuit_opened(breaker, outcome.exception)
+                ):
+                    logger.info(
+                        'Circuit open for {}, rejecting remaining '
+                        'items'.format(breaker.failure_key)
+                    )
+                    rejection = partial(_rejection, breaker)
+
+                yield outcome
+    finally:
+        for task in pending:
+            task.cancel()
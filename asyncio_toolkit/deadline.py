@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import sys
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """
+    Raised when a call does not have enough time left before the
+    deadline of the current context.
+    """
+
+
+def _now():
+    return asyncio.get_event_loop().time()
+
+
+def current_task():
+    """
+    Returns the task running on the current event loop, or None outside
+    of a task.
+    """
+    if sys.version_info < (3, 7):
+        return asyncio.Task.current_task()
+
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class _TaskLocalDeadline:
+    """
+    Keeps one deadline per task, with the ``get``/``set``/``reset``
+    interface of a ``ContextVar``.
+
+    Python 3.6 asyncio tasks do not run in their own ``contextvars``
+    context, so a context variable would be shared by every task on the
+    loop. Tasks created inside a deadline block do not inherit it.
+    """
+
+    def __init__(self):
+        self._deadlines = {}
+
+    def get(self):
+        return self._deadlines.get(current_task())
+
+    def set(self, at):
+        task = current_task()
+        token = (task, self._deadlines.get(task))
+        self._deadlines[task] = at
+        return token
+
+    def reset(self, token):
+        task, previous = token
+        if previous is None:
+            self._deadlines.pop(task, None)
+        else:
+            self._deadlines[task] = previous
+
+    def inherit(self, task):
+        """
+        Gives ``task`` the deadline of the current task until it is done.
+        """
+        at = self.get()
+        if at is None:
+            return
+
+        self._deadlines[task] = at
+        task.add_done_callback(self._forget)
+
+    def _forget(self, task):
+        self._deadlines.pop(task, None)
+
+
+if sys.version_info < (3, 7):
+    _deadline = _TaskLocalDeadline()
+else:
+    import contextvars
+    _deadline = contextvars.ContextVar(
+        'asyncio_toolkit_deadline',
+        default=None
+    )
+
+
+@contextmanager
+def deadline(timeout):
+    """
+    Sets a deadline ``timeout`` seconds from now for everything running
+    inside this block in the current task, including nested calls.
+    A nested deadline can only shorten the one already set.
+
+    On Python 3.7+ tasks created inside the block inherit the deadline;
+    on Python 3.6 it is kept per task and they do not.
+
+    Example:
+
+        with deadline(0.5):
+            await handler(request)
+    """
+    at = _now() + timeout
+    current = _deadline.get()
+    if current is not None and current < at:
+        at = current
+
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """
+    Returns how many seconds are left before the current deadline,
+    or None when no deadline is set.
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - _now()
+
+
+def check_deadline(min_remaining=0):
+    """
+    Raises ``DeadlineExceeded`` when ``min_remaining`` seconds or less are
+    left before the current deadline, otherwise returns the time left.
+    """
+    left = remaining()
+    if left is not None and left <= min_remaining:
+        logger.debug('Deadline exceeded: {:.3f}s left'.format(left))
+        raise DeadlineExceeded()
+    return left
+
+
+async def wait_within_deadline(coro):
+    """
+    Awaits ``coro``, cancelling it and raising ``DeadlineExceeded`` if
+    the current deadline is reached first.
+    """
+    left = remaining()
+    if left is None:
+        return await coro
+
+    # wait_for runs the call in a task of its own, which on Python 3.6
+    # would not see the deadline anymore.
+    task = asyncio.ensure_future(coro)
+    if isinstance(_deadline, _TaskLocalDeadline):
+        _deadline.inherit(task)
+
+    try:
+        return await asyncio.wait_for(task, left)
+    except asyncio.TimeoutError:
+        if remaining() > 0:
+            raise
+        raise DeadlineExceeded()
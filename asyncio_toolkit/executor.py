@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoundedExecutor(ThreadPoolExecutor):
+    """
+    Thread pool with at most ``max_workers`` threads that keeps track of
+    how many submitted calls are waiting for a thread (``queue_depth``)
+    and how many are running, to help tuning its size.
+
+    It is meant to run blocking callables protected by a circuit breaker:
+
+        @circuit_breaker(
+            ...,
+            executor=BoundedExecutor(max_workers=8),
+        )
+        def get_invoice(number):
+            return soap_client.service.GetInvoice(number)
+    """
+
+    def __init__(self, max_workers, thread_name_prefix=''):
+        super().__init__(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+        self._counters_lock = threading.Lock()
+        self._queue_depth = 0
+        self._running = 0
+
+    @property
+    def queue_depth(self):
+        return self._queue_depth
+
+    @property
+    def running(self):
+        return self._running
+
+    def submit(self, fn, *args, **kwargs):
+        with self._counters_lock:
+            self._queue_depth += 1
+
+        try:
+            future = super().submit(self._run, fn, *args, **kwargs)
+        except Exception:
+            self._dequeue()
+            raise
+
+        future.add_done_callback(self._forget_cancelled)
+        return future
+
+    def _run(self, fn, *args, **kwargs):
+        with self._counters_lock:
+            self._queue_depth -= 1
+            self._running += 1
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._counters_lock:
+                self._running -= 1
+
+    def _forget_cancelled(self, future):
+        if future.cancelled():
+            self._dequeue()
+
+    def _dequeue(self):
+        with self._counters_lock:
+            self._queue_depth -= 1
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from functools import wraps
+
+from .circuit_breaker.coroutine import (
+    circuit_breaker as coroutine_circuit_breaker
+)
+from .deadline import remaining
+from .stats import SlidingWindow
+
+logger = logging.getLogger(__name__)
+
+
+class hedge:
+    """
+    Reduces tail latency of idempotent calls: when a call is still
+    outstanding after a delay, a second attempt is fired and the first
+    successful one wins, the other being cancelled.
+
+    The delay is ``delay`` seconds or, when ``percentile`` is given and
+    at least ``min_samples`` latencies were observed, that percentile of
+    the last ``window`` latencies (``delay`` is used until then, and no
+    hedging happens if it is None).
+
+    Hedges are paid from a budget: every call earns ``budget`` tokens, up
+    to ``max_tokens``, and every hedge spends one, so at most a ``budget``
+    fraction of the calls is hedged in the long run.
+
+    When ``breaker`` is given, a coroutine or async/await circuit breaker,
+    no hedge is fired while its circuit is open. Decorate the breaker-wrapped function so every attempt goes
+    through the breaker; cancelled attempts are never counted as
+    failures by it.
+
+    Example:
+
+        @hedge(percentile=95, delay=0.05, breaker=breaker)
+        @breaker
+        async def get_product(sku):
+            ...
+    """
+
+    def __init__(
+        self,
+        delay=None,
+        percentile=None,
+        budget=0.1,
+        max_tokens=10,
+        min_samples=20,
+        window=1000,
+        breaker=None
+    ):
+        self.delay = delay
+        self.percentile = percentile
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.min_samples = min_samples
+        self.breaker = breaker
+        self.hedged = 0
+        self._tokens = max_tokens
+        self._latencies = SlidingWindow(window)
+
+        if breaker is not None and not isinstance(
+            breaker,
+            coroutine_circuit_breaker
+        ):
+            raise ValueError(
+                'breaker must be a coroutine or async/await circuit breaker'
+            )
+
+    @property
+    def hedge_delay(self):
+        if self.percentile is None or len(self._latencies) < self.min_samples:
+            return self.delay
+        return self._latencies.percentile(self.percentile)
+
+    def __call__(self, method):
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            self._tokens = min(self._tokens + self.budget, self.max_tokens)
+            loop = asyncio.get_event_loop()
+            started_at = loop.time()
+            attempts = [asyncio.ensure_future(method(*args, **kwargs))]
+
+            try:
+                delay = self.hedge_delay
+                if delay is not None:
+                    await asyncio.wait(attempts, timeout=delay)
+
+                    if not attempts[0].done() and (await self._can_hedge()):
+                        self._tokens -= 1
+                        self.hedged += 1
+                        attempts.append(
+                            asyncio.ensure_future(method(*args, **kwargs))
+                        )
+
+                result = await self._first_success(attempts)
+            finally:
+                for attempt in attempts:
+                    attempt.cancel()
+
+            self._latencies.add(loop.time() - started_at)
+            return result
+
+        return wrapper
+
+    async def _can_hedge(self):
+        if self._tokens < 1:
+            return False
+
+        left = remaining()
+        if left is not None and left <= 0:
+            return False
+
+        if self.breaker is not None and (await self.breaker.is_circuit_open):
+            logger.debug('Not hedging, circuit is open for: {}'.format(
+                self.breaker.failure_key
+            ))
+            return False
+
+        return True
+
+    async def _first_success(self, attempts):
+        pending = set(attempts)
+        error = None
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            # Every exception is read, so none is reported as never
+            # retrieved when another attempt of the same batch wins.
+            exceptions = {
+                attempt: attempt.exception()
+                for attempt in done
+                if not attempt.cancelled()
+            }
+            for attempt, exception in exceptions.items():
+                if exception is None:
+                    return attempt.result()
+                error = exception
+
+        raise error or asyncio.CancelledError()
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from functools import partial
+
+from .stats import SlidingWindow
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs a callback scheduled every
+    ``interval`` seconds. That scheduling delay (lag) grows when the
+    loop is saturated and affects every coroutine running on it.
+
+    The last ``window`` samples are kept for percentile queries and every
+    sample is passed to the registered callbacks.
+
+    ``lagging`` builds a predicate to be given to a circuit breaker as
+    ``shed_when``, rejecting its calls while the loop is overloaded:
+
+        monitor = LoopLagMonitor()
+        monitor.start()
+
+        @circuit_breaker(
+            ...,
+            shed_when=monitor.lagging(0.1, percentile=90),
+        )
+        async def non_critical_call():
+            ...
+    """
+
+    def __init__(self, interval=0.25, window=120, loop=None):
+        self.interval = interval
+        self.lag = None
+        self._loop = loop
+        self._samples = SlidingWindow(window)
+        self._callbacks = []
+        self._handle = None
+
+    @property
+    def is_running(self):
+        return self._handle is not None
+
+    def start(self):
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        if not self.is_running:
+            self._schedule()
+
+    def stop(self):
+        """
+        Stops probing and forgets the samples taken, so a stopped monitor
+        is never lagging.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self.lag = None
+        self._samples.clear()
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def percentile(self, percentile):
+        return self._samples.percentile(percentile)
+
+    def is_lagging(self, threshold, percentile=None):
+        """
+        Tells whether the last lag sample, or the given ``percentile`` of
+        the recent ones, is above ``threshold`` seconds.
+        """
+        if percentile is None:
+            lag = self.lag
+        else:
+            lag = self._samples.percentile(percentile)
+        return lag is not None and lag > threshold
+
+    def lagging(self, threshold, percentile=None):
+        return partial(self.is_lagging, threshold, percentile)
+
+    def _schedule(self):
+        expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(expected, self._probe, expected)
+
+    def _probe(self, expected):
+        self.lag = max(self._loop.time() - expected, 0)
+        self._samples.add(self.lag)
+        self._schedule()
+
+        for callback in self._callbacks:
+            try:
+                callback(self.lag)
+            except Exception:
+                logger.exception('Loop lag callback failed')
@@ -0,0 +1,39 @@
+import math
+from collections import deque
+
+
+class SlidingWindow:
+    """
+    Keeps the last ``size`` samples of a measure and answers percentile
+    queries over them. The sorted view is cached until a new sample
+    arrives, so repeated queries between samples are cheap.
+    """
+
+    def __init__(self, size=100):
+        self._samples = deque(maxlen=size)
+        self._sorted = None
+
+    def add(self, value):
+        self._samples.append(value)
+        self._sorted = None
+
+    def percentile(self, percentile):
+        """
+        Returns the nearest-rank ``percentile`` (0-100) of the samples,
+        or None when there are no samples yet.
+        """
+        if not self._samples:
+            return None
+
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+
+        rank = math.ceil(percentile / 100 * len(self._sorted))
+        return self._sorted[max(rank - 1, 0)]
+
+    def clear(self):
+        self._samples.clear()
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._samples)
@@ -0,0 +1,121 @@
+"""
+Goodput of a saturated service under 2x overload, with and without
+``AdmissionController``.
+
+The service runs ``CONCURRENCY`` calls at a time, each taking
+``SERVICE_TIME`` seconds, and receives twice the rate it can serve.
+Clients give up after ``CLIENT_TIMEOUT`` seconds, so only calls answered
+within it count as goodput. Half of the calls are critical (priority 0)
+and half are sheddable (priority 1).
+
+Usage:
+
+    python benchmarks/admission_overload.py
+"""
+import asyncio
+import random
+from collections import Counter
+
+from asyncio_toolkit.admission import AdmissionController, AdmissionRejected
+
+CONCURRENCY = 4
+SERVICE_TIME = 0.02
+CAPACITY = CONCURRENCY / SERVICE_TIME
+OVERLOAD = 2
+DURATION = 3
+CLIENT_TIMEOUT = 0.2
+
+
+async def serve():
+    await asyncio.sleep(SERVICE_TIME)
+
+
+async def unprotected(semaphore, priority):
+    async with semaphore:
+        await serve()
+
+
+def protected(admission):
+    calls = [admission(serve, priority=priority) for priority in (0, 1)]
+
+    async def call(semaphore, priority):
+        await calls[priority]()
+
+    return call
+
+
+async def client(call, semaphore, priority, stats):
+    loop = asyncio.get_event_loop()
+    started_at = loop.time()
+
+    try:
+        await call(semaphore, priority)
+    except AdmissionRejected:
+        stats['rejected', priority] += 1
+        return
+
+    if loop.time() - started_at <= CLIENT_TIMEOUT:
+        stats['good', priority] += 1
+    else:
+        stats['late', priority] += 1
+
+
+async def run(call):
+    random.seed(42)
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    stats = Counter()
+    clients = []
+    ends_at = loop.time() + DURATION
+
+    while loop.time() < ends_at:
+        priority = random.randint(0, 1)
+        clients.append(asyncio.ensure_future(
+            client(call, semaphore, priority, stats)
+        ))
+        await asyncio.sleep(random.expovariate(CAPACITY * OVERLOAD))
+
+    await asyncio.gather(*clients)
+    return stats, len(clients)
+
+
+def report(name, stats, total):
+    goodput = sum(
+        count for (kind, _), count in stats.items() if kind == 'good'
+    ) / DURATION
+    print('{:<20} goodput {:6.1f}/s ({:.0%} of capacity)'.format(
+        name,
+        goodput,
+        goodput / CAPACITY
+    ))
+    for priority in (0, 1):
+        print('    priority {}: good {:5d}  late {:5d}  rejected {:5d}'.format(
+            priority,
+            stats['good', priority],
+            stats['late', priority],
+            stats['rejected', priority],
+        ))
+
+
+def main():
+    loop = asyncio.get_event_loop()
+    print('capacity {:.0f}/s, offered {:.0f}/s, client timeout {}s'.format(
+        CAPACITY,
+        CAPACITY * OVERLOAD,
+        CLIENT_TIMEOUT
+    ))
+
+    report('unbounded queue', *loop.run_until_complete(run(unprotected)))
+
+    admission = AdmissionController(
+        max_concurrency=CONCURRENCY,
+        max_queue=50,
+        priorities=2,
+    )
+    report('admission control', *loop.run_until_complete(
+        run(protected(admission))
+    ))
+
+
+if __name__ == '__main__':
+    main()
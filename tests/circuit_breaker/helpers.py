@@ -1,2 +1,22 @@
+from unittest import mock
+
+
 class MyException(Exception):
     pass
+
+
+def coroutine_mock(return_value=None):
+    async def side_effect(*args, **kwargs):
+        return return_value
+
+    return mock.Mock(side_effect=side_effect)
+
+
+def create_storage_mock(is_circuit_open=False, failures=1):
+    storage = mock.Mock()
+    storage.get = coroutine_mock(1 if is_circuit_open else None)
+    storage.set = coroutine_mock()
+    storage.delete = coroutine_mock()
+    storage.expire = coroutine_mock()
+    storage.increment = coroutine_mock(failures)
+    return storage
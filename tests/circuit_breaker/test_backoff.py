@@ -0,0 +1,238 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.backoff import ExponentialBackoff
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+from asyncio_toolkit.circuit_breaker.simulation import (
+    VirtualClockLoop,
+    VirtualClockStorage
+)
+
+from .helpers import MyException
+
+
+class LatencyStorage(VirtualClockStorage):
+    """
+    Storage whose every operation takes a network round-trip.
+    """
+
+    async def get(self, key):
+        await asyncio.sleep(0.001)
+        return await super().get(key)
+
+    async def set(self, key, value, ttl=None):
+        await asyncio.sleep(0.001)
+        await super().set(key, value, ttl)
+
+    async def add(self, key, value, ttl=None):
+        await asyncio.sleep(0.001)
+        await super().add(key, value, ttl)
+
+    async def increment(self, key, delta=1):
+        await asyncio.sleep(0.001)
+        return await super().increment(key, delta)
+
+    async def expire(self, key, ttl):
+        await asyncio.sleep(0.001)
+        await super().expire(key, ttl)
+
+    async def delete(self, key):
+        await asyncio.sleep(0.001)
+        return await super().delete(key)
+
+
+class TestExponentialBackoff:
+
+    @pytest.mark.parametrize('trips,timeout', [
+        (1, 10),
+        (2, 20),
+        (3, 40),
+        (5, 100),
+        (1000, 100),
+    ])
+    def test_timeout(self, trips, timeout):
+        backoff = ExponentialBackoff(max_timeout=100, jitter=0)
+
+        assert backoff.timeout(10, trips) == timeout
+
+    def test_timeout_with_jitter(self):
+        backoff = ExponentialBackoff(max_timeout=1000, jitter=0.1)
+
+        timeouts = {backoff.timeout(100, 2) for _ in range(100)}
+
+        assert min(timeouts) >= 180
+        assert max(timeouts) <= 220
+        assert len(timeouts) > 1
+
+    def test_trips_timeout(self):
+        backoff = ExponentialBackoff(reset_after=60)
+
+        assert backoff.trips_timeout(20) == 80
+
+
+class TestCircuitBreakerBackoff:
+
+    def test_should_require_circuit_timeout(self, memory):
+        with pytest.raises(ValueError):
+            CircuitBreaker(
+                storage=memory,
+                failure_key='backoff',
+                max_failures=1,
+                max_failure_exception=MyException,
+                backoff=ExponentialBackoff(),
+            )
+
+    def test_should_require_storage_supporting_add(self):
+        storage = mock.Mock(spec=['get', 'set', 'increment', 'expire'])
+
+        with pytest.raises(ValueError):
+            CircuitBreaker(
+                storage=storage,
+                failure_key='backoff',
+                max_failures=1,
+                max_failure_exception=MyException,
+                circuit_timeout=10,
+                backoff=ExponentialBackoff(),
+            )
+
+    def test_should_open_circuit_again_after_it_expires(self, memory):
+        breaker = CircuitBreaker(
+            storage=memory,
+            failure_key='backoff',
+            max_failures=1,
+            max_failure_exception=MyException,
+            circuit_timeout=1,
+            catch_exceptions=(ValueError,),
+            backoff=ExponentialBackoff(jitter=0),
+        )
+
+        def fail():
+            with pytest.raises(MyException):
+                with breaker:
+                    raise ValueError()
+
+        fail()
+        assert breaker.is_circuit_open
+
+        time.sleep(1.1)
+        assert not breaker.is_circuit_open
+
+        fail()
+        assert breaker.is_circuit_open
+        assert memory.get('trips_backoff') == 2
+
+    def test_should_store_trips_and_grow_circuit_timeout(self, memory):
+        breaker = CircuitBreaker(
+            storage=memory,
+            failure_key='backoff',
+            max_failures=1,
+            max_failure_exception=MyException,
+            circuit_timeout=10,
+            backoff=ExponentialBackoff(jitter=0, reset_after=60),
+        )
+        memory.set('trips_backoff', 2, 100)
+
+        with mock.patch.object(memory, 'set', wraps=memory.set) as set_mock:
+            breaker.open_circuit()
+
+        set_mock.assert_called_once_with('circuit_backoff', 1, 40)
+        assert memory.get('trips_backoff') == 3
+        assert memory._timeout['trips_backoff']
+
+    def test_should_not_count_trip_when_circuit_is_already_open(
+        self,
+        memory
+    ):
+        breaker = CircuitBreaker(
+            storage=memory,
+            failure_key='backoff',
+            max_failures=1,
+            max_failure_exception=MyException,
+            circuit_timeout=10,
+            backoff=ExponentialBackoff(jitter=0),
+        )
+        memory.set('circuit_backoff', 1, 10)
+        memory.set('trips_backoff', 2, 100)
+
+        breaker.open_circuit()
+
+        assert memory.get('trips_backoff') == 2
+
+    def test_concurrent_nodes_should_count_one_trip(self):
+        loop = VirtualClockLoop()
+        storage = LatencyStorage()
+        breakers = [
+            circuit_breaker(
+                storage=storage,
+                failure_key='backoff',
+                max_failures=10,
+                max_failure_exception=MyException,
+                circuit_timeout=10,
+                catch_exceptions=(ValueError,),
+                backoff=ExponentialBackoff(jitter=0),
+            )
+            for _ in range(20)
+        ]
+
+        async def call(breaker):
+            @breaker
+            async def fail():
+                await asyncio.sleep(0.01)
+                raise ValueError()
+
+            try:
+                await fail()
+            except (ValueError, MyException):
+                pass
+
+        async def scenario():
+            await asyncio.gather(*[call(breaker) for breaker in breakers])
+            return (
+                await storage.get('trips_backoff'),
+                storage._expires_at['circuit_backoff'] - loop.time(),
+            )
+
+        trips, circuit_ttl = loop.run_until_complete(scenario())
+        loop.close()
+
+        assert trips == 1
+        assert circuit_ttl == pytest.approx(10, abs=0.1)
+
+    def test_nodes_should_back_off_together_and_reset(self):
+        loop = VirtualClockLoop()
+        storage = VirtualClockStorage()
+        breakers = [
+            circuit_breaker(
+                storage=storage,
+                failure_key='backoff',
+                max_failures=1,
+                max_failure_exception=MyException,
+                circuit_timeout=10,
+                backoff=ExponentialBackoff(jitter=0, reset_after=60),
+            )
+            for _ in range(2)
+        ]
+
+        async def open_duration(breaker):
+            opened_at = loop.time()
+            await breaker.open_circuit()
+            while await breaker.is_circuit_open:
+                await asyncio.sleep(1)
+            return loop.time() - opened_at
+
+        async def scenario():
+            durations = [
+                await open_duration(breakers[0]),
+                await open_duration(breakers[1]),
+                await open_duration(breakers[0]),
+            ]
+            await asyncio.sleep(120)
+            durations.append(await open_duration(breakers[1]))
+            return durations
+
+        assert loop.run_until_complete(scenario()) == [10, 20, 40, 10]
+        loop.close()
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.classifier import ExceptionClassifier
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+
+from .helpers import MyException, create_storage_mock
+
+
+class MyValueError(ValueError):
+    pass
+
+
+class TestExceptionClassifier:
+
+    def test_should_match_subclasses(self):
+        classifier = ExceptionClassifier(catch=(ValueError,))
+
+        assert classifier(MyValueError())
+        assert not classifier(KeyError())
+
+    def test_should_match_exact_types_only(self):
+        classifier = ExceptionClassifier(catch=(ValueError,), subclasses=False)
+
+        assert classifier(ValueError())
+        assert not classifier(MyValueError())
+
+    def test_should_not_match_excluded_types(self):
+        classifier = ExceptionClassifier(
+            catch=(ValueError,),
+            exclude=(MyValueError,)
+        )
+
+        assert classifier(ValueError())
+        assert not classifier(MyValueError())
+
+    def test_should_classify_exception_types(self):
+        classifier = ExceptionClassifier(catch=(ValueError,))
+
+        assert classifier(MyValueError)
+        assert not classifier(None)
+
+    def test_should_never_match_cancellation(self):
+        classifier = ExceptionClassifier(
+            catch=(BaseException, asyncio.CancelledError)
+        )
+
+        assert not classifier(asyncio.CancelledError())
+
+    def test_should_memoize_decisions_per_type(self):
+        classifier = ExceptionClassifier(catch=(ValueError,))
+        classifier(ValueError())
+        classifier.catch = ()
+
+        assert classifier(ValueError())
+        assert not classifier(MyValueError())
+
+    def test_is_failure_result(self):
+        classifier = ExceptionClassifier(
+            result_predicate=lambda status: status >= 500
+        )
+
+        assert classifier.is_failure_result(503)
+        assert not classifier.is_failure_result(200)
+        assert not ExceptionClassifier().is_failure_result(503)
+
+
+class TestCircuitBreakerClassifier:
+
+    def test_default_classifier_should_keep_exact_matching(self, memory):
+        with pytest.raises(MyValueError):
+            with CircuitBreaker(
+                storage=memory,
+                failure_key='classifier',
+                max_failures=1,
+                max_failure_exception=MyException,
+                catch_exceptions=(ValueError,),
+            ):
+                raise MyValueError()
+
+        assert not memory.get('classifier')
+
+    def test_should_count_subclasses_with_classifier(self, memory):
+        with pytest.raises(MyException):
+            with CircuitBreaker(
+                storage=memory,
+                failure_key='classifier',
+                max_failures=1,
+                max_failure_exception=MyException,
+                classifier=ExceptionClassifier(catch=(ValueError,)),
+            ):
+                raise MyValueError()
+
+    def test_should_count_failure_results_without_raising(self, run_sync):
+        storage = create_storage_mock(failures=10)
+
+        @circuit_breaker(
+            storage=storage,
+            failure_key='classifier',
+            max_failures=10,
+            max_failure_exception=MyException,
+            classifier=ExceptionClassifier(
+                result_predicate=lambda status: status >= 500
+            ),
+        )
+        async def call(status):
+            return status
+
+        assert run_sync(call(200)) == 200
+        assert not storage.increment.called
+
+        assert run_sync(call(503)) == 503
+        storage.increment.assert_called_once_with('classifier', 1)
+        assert storage.set.called
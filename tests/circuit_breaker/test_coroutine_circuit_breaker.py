@@ -338,3 +338,146 @@ class TestCoroutineCircuitBreaker:
         fail_example = request.getfuncargvalue(fail_example_fixture)
         with pytest.raises(ValueError):
             run_sync(fail_example())
+
+
+class TestCoroutineCircuitBreakerContextManager:
+
+    @pytest.fixture
+    def flush_cache(self, memcached, redis, run_sync):
+        run_sync(redis.clear())
+        run_sync(memcached.clear())
+
+    @pytest.fixture
+    def open_circuit(self, memcached, redis, run_sync):
+        key = 'circuit_{}'.format(failure_key)
+        run_sync(memcached.set(key, 1))
+        run_sync(redis.set(key, 1))
+
+    def _create_breaker(self, breaker_class, storage):
+        return breaker_class(
+            storage=storage,
+            failure_key=failure_key,
+            max_failures=max_failures,
+            max_failure_exception=MyException,
+            max_failure_timeout=max_failure_timeout,
+            circuit_timeout=10,
+            catch_exceptions=(ValueError,),
+        )
+
+    def _fail_within(self, breaker):
+        async def fn():
+            async with breaker:
+                raise ValueError()
+
+        return fn()
+
+    @pytest.mark.parametrize(
+        'breaker_class,storage_type,set_failure_count',
+        [
+            (async_circuit_breaker, 'memcached', set_failure_count_memcached),
+            (circuit_breaker, 'memcached', set_failure_count_memcached),
+            (circuit_breaker, 'redis', set_failure_count_redis),
+        ]
+    )
+    def test_error_is_raised_when_max_failures_exceeds_max_value(
+        self,
+        request,
+        breaker_class,
+        storage_type,
+        set_failure_count,
+        run_sync,
+        flush_cache
+    ):
+        storage = request.getfuncargvalue(storage_type)
+        breaker = self._create_breaker(breaker_class, storage)
+        set_failure_count(request, max_failures - 1)
+
+        with pytest.raises(MyException):
+            run_sync(self._fail_within(breaker))
+
+        assert run_sync(breaker.is_circuit_open)
+
+    @pytest.mark.parametrize(
+        'breaker_class,storage_type,set_failure_count,get_failure_count',
+        [
+            (
+                async_circuit_breaker,
+                'memcached',
+                set_failure_count_memcached,
+                get_failure_count_memcached
+            ),
+            (
+                circuit_breaker,
+                'memcached',
+                set_failure_count_memcached,
+                get_failure_count_memcached
+            ),
+            (
+                circuit_breaker,
+                'redis',
+                set_failure_count_redis,
+                get_failure_count_redis
+            ),
+        ]
+    )
+    def test_catched_error_is_raised_and_counted(
+        self,
+        request,
+        breaker_class,
+        storage_type,
+        set_failure_count,
+        get_failure_count,
+        run_sync,
+        flush_cache
+    ):
+        storage = request.getfuncargvalue(storage_type)
+        breaker = self._create_breaker(breaker_class, storage)
+        set_failure_count(request, 1)
+
+        with pytest.raises(ValueError):
+            run_sync(self._fail_within(breaker))
+
+        assert get_failure_count(request, run_sync) == 2
+
+    @pytest.mark.parametrize(
+        'breaker_class,storage_type,set_failure_count,get_failure_count',
+        [
+            (
+                async_circuit_breaker,
+                'memcached',
+                set_failure_count_memcached,
+                get_failure_count_memcached
+            ),
+            (
+                circuit_breaker,
+                'memcached',
+                set_failure_count_memcached,
+                get_failure_count_memcached
+            ),
+            (
+                circuit_breaker,
+                'redis',
+                set_failure_count_redis,
+                get_failure_count_redis
+            ),
+        ]
+    )
+    def test_should_not_enter_when_circuit_is_open(
+        self,
+        request,
+        breaker_class,
+        storage_type,
+        set_failure_count,
+        get_failure_count,
+        run_sync,
+        flush_cache,
+        open_circuit,
+    ):
+        storage = request.getfuncargvalue(storage_type)
+        breaker = self._create_breaker(breaker_class, storage)
+        set_failure_count(request, 999)
+
+        with pytest.raises(MyException):
+            run_sync(self._fail_within(breaker))
+
+        assert get_failure_count(request, run_sync) == 999
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+from asyncio_toolkit.circuit_breaker.factory import CircuitBreakerFactory
+
+from .helpers import MyException
+
+
+class TestCircuitBreakerFactory:
+
+    @pytest.fixture
+    def factory(self, memory):
+        return CircuitBreakerFactory(
+            CircuitBreaker,
+            maxsize=2,
+            storage=memory,
+            max_failures=10,
+            max_failure_exception=MyException,
+        )
+
+    def test_should_return_same_breaker_for_same_key(self, factory):
+        assert factory.get('tenant_1') is factory.get('tenant_1')
+
+    def test_should_create_breaker_with_given_key(self, factory, memory):
+        breaker = factory.get('tenant_1')
+
+        assert breaker.failure_key == 'tenant_1'
+        assert breaker.circuit_key == 'circuit_tenant_1'
+        assert breaker.storage is memory
+
+    def test_should_evict_least_recently_used_key(self, factory):
+        factory.get('tenant_1')
+        factory.get('tenant_2')
+        factory.get('tenant_1')
+        factory.get('tenant_3')
+
+        assert 'tenant_1' in factory
+        assert 'tenant_2' not in factory
+        assert len(factory) == 2
+
+    def test_should_release_evicted_breaker(self, factory):
+        breaker = factory.get('tenant_1')
+        factory.get('tenant_2')
+
+        with mock.patch.object(CircuitBreaker, 'release') as release:
+            factory.get('tenant_3')
+
+        release.assert_called_once_with()
+        assert factory.get('tenant_1') is not breaker
+
+    def test_should_evict_idle_keys(self, memory):
+        factory = CircuitBreakerFactory(
+            CircuitBreaker,
+            idle_timeout=30,
+            storage=memory,
+            max_failures=10,
+            max_failure_exception=MyException,
+        )
+
+        with mock.patch('time.monotonic', return_value=100):
+            factory.get('tenant_1')
+        with mock.patch('time.monotonic', return_value=200):
+            factory.get('tenant_2')
+
+        assert 'tenant_1' not in factory
+        assert 'tenant_2' in factory
+
+    def test_clear(self, factory):
+        factory.get('tenant_1')
+        factory.clear()
+
+        assert not len(factory)
+
+    def test_breakers_do_not_have_instance_dict(self, factory):
+        assert not hasattr(factory.get('tenant_1'), '__dict__')
@@ -0,0 +1,143 @@
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.fallback import LastKnownGood
+
+from .helpers import MyException, create_storage_mock
+
+
+class TestLastKnownGood:
+
+    def test_should_return_recorded_result(self):
+        fallback = LastKnownGood()
+        fallback.record('key', (1,), {'a': 2}, 'result')
+
+        assert fallback.get('key', (1,), {'a': 2}, ValueError()) == 'result'
+
+    def test_should_raise_exception_when_result_is_unknown(self):
+        fallback = LastKnownGood()
+        fallback.record('key', (1,), {}, 'result')
+
+        with pytest.raises(ValueError):
+            fallback.get('key', (2,), {}, ValueError())
+
+    def test_should_raise_exception_when_result_is_expired(self):
+        fallback = LastKnownGood(ttl=10)
+
+        with mock.patch('time.monotonic', return_value=100):
+            fallback.record('key', (), {}, 'result')
+
+        with mock.patch('time.monotonic', return_value=111):
+            with pytest.raises(ValueError):
+                fallback.get('key', (), {}, ValueError())
+
+        assert not len(fallback)
+
+    def test_should_not_record_unhashable_arguments(self):
+        fallback = LastKnownGood()
+        fallback.record('key', ([],), {}, 'result')
+
+        assert not len(fallback)
+
+    def test_should_keep_at_most_maxsize_results(self):
+        fallback = LastKnownGood(maxsize=2)
+        for value in range(3):
+            fallback.record('key', (value,), {}, value)
+
+        assert len(fallback) == 2
+        with pytest.raises(ValueError):
+            fallback.get('key', (0,), {}, ValueError())
+
+    def test_should_evict_least_recently_served_result(self):
+        fallback = LastKnownGood(maxsize=2)
+        fallback.record('key', (0,), {}, 0)
+        fallback.record('key', (1,), {}, 1)
+
+        fallback.get('key', (0,), {}, ValueError())
+        fallback.record('key', (2,), {}, 2)
+
+        assert fallback.get('key', (0,), {}, ValueError()) == 0
+        with pytest.raises(ValueError):
+            fallback.get('key', (1,), {}, ValueError())
+
+    def test_discard(self):
+        fallback = LastKnownGood()
+        fallback.record('key', (), {}, 'result')
+        fallback.record('other_key', (), {}, 'result')
+
+        fallback.discard('key')
+
+        assert len(fallback) == 1
+
+
+class TestCircuitBreakerFallback:
+
+    def _create_breaker(self, storage, fallback):
+        return circuit_breaker(
+            storage=storage,
+            failure_key='fallback',
+            max_failures=10,
+            max_failure_exception=MyException,
+            catch_exceptions=(ValueError,),
+            fallback=fallback,
+        )
+
+    def test_should_call_fallback_when_circuit_is_open(self, run_sync):
+        fallback = mock.Mock(return_value='fallback')
+
+        @self._create_breaker(create_storage_mock(True), fallback)
+        async def call(value):
+            return value
+
+        assert run_sync(call(1)) == 'fallback'
+        exception, value = fallback.call_args[0]
+        assert isinstance(exception, MyException)
+        assert value == 1
+
+    def test_should_await_coroutine_fallback(self, run_sync):
+        async def fallback(exception, value):
+            return value * 2
+
+        @self._create_breaker(create_storage_mock(), fallback)
+        async def call(value):
+            raise ValueError()
+
+        assert run_sync(call(2)) == 4
+
+    def test_should_not_call_fallback_for_uncatchable_errors(self, run_sync):
+        fallback = mock.Mock()
+
+        @self._create_breaker(create_storage_mock(), fallback)
+        async def call():
+            raise KeyError()
+
+        with pytest.raises(KeyError):
+            run_sync(call())
+
+        assert not fallback.called
+
+    def test_should_serve_last_known_good_result(self, run_sync):
+        storage = create_storage_mock()
+        results = [ValueError(), 'result']
+
+        @self._create_breaker(storage, LastKnownGood())
+        async def call(value):
+            result = results.pop()
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert run_sync(call(1)) == 'result'
+        assert run_sync(call(1)) == 'result'
+        storage.increment.assert_called_once_with('fallback', 1)
+
+    def test_release_should_discard_last_known_good_results(self):
+        fallback = LastKnownGood()
+        breaker = self._create_breaker(create_storage_mock(), fallback)
+        fallback.record('fallback', (), {}, 'result')
+
+        breaker.release()
+
+        assert not len(fallback)
@@ -0,0 +1,126 @@
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker import ramp
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+
+from .helpers import MyException, coroutine_mock, create_storage_mock
+
+
+def fail_function():
+    raise ValueError()
+
+
+class TestRampStrategies:
+
+    @pytest.mark.parametrize('strategy', [ramp.linear, ramp.exponential])
+    def test_should_grow_up_to_all_calls(self, strategy):
+        fractions = [strategy(step / 10) for step in range(11)]
+
+        assert fractions == sorted(fractions)
+        assert fractions[0] == ramp.MIN_FRACTION
+        assert fractions[-1] == 1
+
+    def test_exponential_should_admit_less_than_linear(self):
+        assert ramp.exponential(0.5) < ramp.linear(0.5)
+
+
+class TestCircuitBreakerRamp:
+
+    @pytest.fixture
+    def breaker(self, memory):
+        return CircuitBreaker(
+            storage=memory,
+            failure_key='ramp',
+            max_failures=10,
+            max_failure_exception=MyException,
+            max_failure_timeout=60,
+            circuit_timeout=10,
+            catch_exceptions=(ValueError,),
+            ramp_period=100,
+        )
+
+    @pytest.fixture
+    def ramping_breaker(self, breaker, memory):
+        memory.set(breaker.circuit_key, 1, 10)
+        with pytest.raises(MyException):
+            with breaker:
+                pass
+
+        memory.set(breaker.circuit_key, None, 10)
+        with mock.patch('time.monotonic', return_value=1000):
+            breaker._check_circuit()
+
+        return breaker
+
+    @pytest.mark.parametrize('elapsed,admitted', [
+        (10, False),
+        (60, True),
+        (100, True),
+    ])
+    def test_should_admit_growing_fraction_of_calls(
+        self,
+        ramping_breaker,
+        elapsed,
+        admitted
+    ):
+        with mock.patch('time.monotonic', return_value=1000 + elapsed):
+            with mock.patch('random.random', return_value=0.5):
+                try:
+                    with ramping_breaker:
+                        pass
+                except MyException:
+                    assert not admitted
+                else:
+                    assert admitted
+
+    def test_should_reopen_circuit_on_failure_during_ramp(
+        self,
+        ramping_breaker,
+        memory
+    ):
+        with mock.patch('time.monotonic', return_value=1050):
+            with mock.patch('random.random', return_value=0):
+                with pytest.raises(MyException):
+                    with ramping_breaker:
+                        fail_function()
+
+        assert memory.get(ramping_breaker.circuit_key)
+
+    def test_should_not_ramp_without_seeing_circuit_open(self, breaker):
+        with mock.patch('random.random', return_value=0.99):
+            with breaker:
+                pass
+
+    def test_release_should_stop_ramp(self, ramping_breaker):
+        ramping_breaker.release()
+
+        with mock.patch('random.random', return_value=0.99):
+            with ramping_breaker:
+                pass
+
+    def test_coroutine_breaker_should_ramp_after_circuit_closes(
+        self,
+        run_sync
+    ):
+        storage = create_storage_mock(is_circuit_open=True)
+
+        @circuit_breaker(
+            storage=storage,
+            failure_key='ramp',
+            max_failures=10,
+            max_failure_exception=MyException,
+            ramp_period=100,
+        )
+        async def call():
+            return True
+
+        with pytest.raises(MyException):
+            run_sync(call())
+
+        storage.get = coroutine_mock()
+        with mock.patch('random.random', return_value=0.5):
+            with pytest.raises(MyException):
+                run_sync(call())
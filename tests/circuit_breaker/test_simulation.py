@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.backoff import ExponentialBackoff
+from asyncio_toolkit.circuit_breaker.simulation import (
+    TraceRequest,
+    VirtualClockLoop,
+    VirtualClockStorage,
+    run,
+    simulate
+)
+
+
+def create_trace(size, failed, interval=0.1, latency=0.01):
+    return [
+        TraceRequest(at=i * interval, latency=latency, failed=failed(i))
+        for i in range(size)
+    ]
+
+
+class TestVirtualClockLoop:
+
+    def test_should_not_wait_for_timers(self):
+        loop = VirtualClockLoop()
+        started_at = time.monotonic()
+
+        loop.run_until_complete(asyncio.sleep(3600))
+
+        assert loop.time() == pytest.approx(3600)
+        assert time.monotonic() - started_at < 1
+        loop.close()
+
+    def test_should_fail_instead_of_waiting_forever(self):
+        loop = VirtualClockLoop()
+
+        with pytest.raises(RuntimeError):
+            loop.run_until_complete(loop.create_future())
+        loop.close()
+
+
+class TestVirtualClockStorage:
+
+    def test_should_expire_keys_on_virtual_time(self):
+        loop = VirtualClockLoop()
+        storage = VirtualClockStorage()
+
+        async def scenario():
+            await storage.set('key', 1, 10)
+            await asyncio.sleep(9)
+            before = await storage.get('key')
+            await asyncio.sleep(2)
+            return before, await storage.get('key')
+
+        assert loop.run_until_complete(scenario()) == (1, None)
+        loop.close()
+
+    def test_increment(self):
+        loop = VirtualClockLoop()
+        storage = VirtualClockStorage()
+
+        async def scenario():
+            await storage.increment('key', 1)
+            return await storage.increment('key', 1)
+
+        assert loop.run_until_complete(scenario()) == 2
+        loop.close()
+
+
+class TestSimulation:
+
+    @pytest.fixture
+    def outage_trace(self):
+        return create_trace(1000, lambda i: 300 <= i < 600)
+
+    def test_should_report_trips_during_outage(self, outage_trace):
+        report = run(
+            outage_trace,
+            {
+                'max_failures': 5,
+                'max_failure_timeout': 10,
+                'circuit_timeout': 5,
+            },
+            outages=[(30, 60)],
+        )
+
+        assert report.trips
+        assert report.false_trip_rate == 0
+        assert report.trip_delays == [pytest.approx(0.41)]
+        assert report.rejected
+        assert report.failures < 300
+
+    def test_should_report_false_trips(self):
+        trace = create_trace(1000, lambda i: i % 10 == 0)
+
+        report = run(
+            trace,
+            {
+                'max_failures': 2,
+                'max_failure_timeout': 10,
+                'circuit_timeout': 1,
+            },
+        )
+
+        assert report.false_trip_rate == 1
+        assert report.rejected_healthy == report.rejected > 0
+
+    def test_should_not_trip_when_outage_is_tolerated(self, outage_trace):
+        report = run(
+            outage_trace,
+            {
+                'max_failures': 1000,
+                'max_failure_timeout': 10,
+                'circuit_timeout': 5,
+            },
+            outages=[(30, 60)],
+        )
+
+        assert report.trip_delays == [None]
+        assert report.failures == 300
+
+    def test_should_be_deterministic(self, outage_trace):
+        configs = [
+            {
+                'max_failures': max_failures,
+                'max_failure_timeout': 10,
+                'circuit_timeout': 5,
+            }
+            for max_failures in (5, 5, 50)
+        ]
+
+        first, second, third = simulate(
+            outage_trace,
+            configs,
+            outages=[(30, 60)],
+        )
+
+        assert first == second
+        assert third.trip_delays[0] > first.trip_delays[0]
+
+    def test_random_draws_should_be_reproducible(self, outage_trace):
+        config = {
+            'max_failures': 5,
+            'max_failure_timeout': 10,
+            'circuit_timeout': 2,
+            'ramp_period': 5,
+            'backoff': ExponentialBackoff(jitter=0.5, reset_after=30),
+        }
+        random_state = random.getstate()
+
+        first, second = simulate(
+            outage_trace,
+            [config, config],
+            outages=[(30, 60)],
+        )
+
+        assert first == second
+        assert random.getstate() == random_state
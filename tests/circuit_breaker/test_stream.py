@@ -0,0 +1,123 @@
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+
+from .helpers import MyException, coroutine_mock, create_storage_mock
+
+
+def consume(run_sync, stream):
+    chunks = []
+
+    async def fn():
+        async for chunk in stream:
+            chunks.append(chunk)
+
+    run_sync(fn())
+    return chunks
+
+
+class TestCircuitBreakerStream:
+
+    def _create_breaker(self, storage, **kwargs):
+        return circuit_breaker(
+            storage=storage,
+            failure_key='stream',
+            max_failures=10,
+            max_failure_exception=MyException,
+            catch_exceptions=(ValueError,),
+            **kwargs
+        )
+
+    def _create_stream(self, breaker, size, fail_at=None):
+        closed = []
+
+        @breaker
+        async def stream():
+            try:
+                for chunk in range(size):
+                    if chunk == fail_at:
+                        raise ValueError()
+                    yield chunk
+            finally:
+                closed.append(True)
+
+        return stream, closed
+
+    def test_should_stream_chunks(self, run_sync):
+        storage = create_storage_mock()
+        stream, closed = self._create_stream(
+            self._create_breaker(storage),
+            size=3
+        )
+
+        assert consume(run_sync, stream()) == [0, 1, 2]
+        assert closed
+        assert storage.get.call_count == 1
+
+    def test_should_not_accept_fallback(self):
+        breaker = self._create_breaker(
+            create_storage_mock(),
+            fallback=lambda exception: None
+        )
+
+        with pytest.raises(ValueError):
+            self._create_stream(breaker, size=3)
+
+    def test_should_reject_stream_when_circuit_is_open(self, run_sync):
+        stream, closed = self._create_stream(
+            self._create_breaker(create_storage_mock(is_circuit_open=True)),
+            size=3
+        )
+
+        with pytest.raises(MyException):
+            consume(run_sync, stream())
+
+        assert not closed
+
+    def test_should_count_failure_mid_stream_once(self, run_sync):
+        storage = create_storage_mock()
+        stream, closed = self._create_stream(
+            self._create_breaker(storage),
+            size=5,
+            fail_at=2
+        )
+
+        with pytest.raises(ValueError):
+            consume(run_sync, stream())
+
+        storage.increment.assert_called_once_with('stream', 1)
+        assert closed
+
+    def test_should_close_stream_when_circuit_opens(self, run_sync):
+        storage = create_storage_mock()
+        stream, closed = self._create_stream(
+            self._create_breaker(storage, stream_check_every=2),
+            size=10
+        )
+        chunks = []
+
+        async def fn():
+            async for chunk in stream():
+                chunks.append(chunk)
+                storage.get = coroutine_mock(1)
+
+        with pytest.raises(MyException):
+            run_sync(fn())
+
+        assert chunks == [0, 1]
+        assert closed
+
+    def test_should_close_stream_when_consumer_stops(self, run_sync):
+        stream, closed = self._create_stream(
+            self._create_breaker(create_storage_mock()),
+            size=10
+        )
+
+        async def fn():
+            chunks = stream()
+            chunk = await chunks.__anext__()
+            await chunks.aclose()
+            return chunk
+
+        assert run_sync(fn()) == 0
+        assert closed
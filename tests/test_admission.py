@@ -0,0 +1,257 @@
+import asyncio
+
+import pytest
+
+from asyncio_toolkit.admission import AdmissionController, AdmissionRejected
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestAdmissionController:
+
+    def _start(self, admission, name, priority, order):
+        async def call():
+            await admission.acquire(priority)
+            order.append(name)
+
+        return asyncio.ensure_future(call())
+
+    def test_decorator_should_limit_concurrency(self, run_sync):
+        admission = AdmissionController(max_concurrency=2, interval=1)
+        running = []
+        peak = []
+
+        @admission(priority=1)
+        async def call():
+            running.append(True)
+            peak.append(len(running))
+            await asyncio.sleep(0.001)
+            running.pop()
+            return True
+
+        results = run_sync(asyncio.gather(*[call() for _ in range(10)]))
+
+        assert all(results)
+        assert max(peak) == 2
+        assert admission.active == 0
+        assert admission.admitted == 10
+
+    def test_should_admit_most_important_priority_first(self, run_sync):
+        admission = AdmissionController(max_concurrency=1, interval=1)
+        order = []
+
+        async def scenario():
+            await admission.acquire()
+            tasks = [
+                self._start(admission, 'low', 2, order),
+                self._start(admission, 'high', 0, order),
+            ]
+            await settle()
+            admission.release()
+            await settle()
+            admission.release()
+            await asyncio.gather(*tasks)
+
+        run_sync(scenario())
+
+        assert order == ['high', 'low']
+
+    def test_should_admit_newest_first_when_overloaded(self, run_sync):
+        admission = AdmissionController(max_concurrency=1, target_delay=1)
+        order = []
+
+        async def scenario():
+            await admission.acquire()
+            admission.overloaded = True
+            tasks = [
+                self._start(admission, 'first', 1, order),
+                self._start(admission, 'second', 1, order),
+            ]
+            await settle()
+            admission.release()
+            await settle()
+            admission.release()
+            await asyncio.gather(*tasks)
+
+        run_sync(scenario())
+
+        assert order == ['second', 'first']
+
+    def test_should_evict_less_important_call_when_queue_is_full(
+        self,
+        run_sync
+    ):
+        admission = AdmissionController(
+            max_concurrency=1,
+            max_queue=1,
+            interval=1
+        )
+        order = []
+
+        async def scenario():
+            await admission.acquire()
+            low = self._start(admission, 'low', 2, order)
+            await settle()
+            high = self._start(admission, 'high', 0, order)
+            await settle()
+            admission.release()
+            await high
+            with pytest.raises(AdmissionRejected):
+                await low
+
+        run_sync(scenario())
+
+        assert order == ['high']
+        assert admission.rejected == 1
+
+    def test_should_reject_call_when_queue_is_full(self, run_sync):
+        admission = AdmissionController(
+            max_concurrency=1,
+            max_queue=1,
+            interval=1
+        )
+
+        async def scenario():
+            await admission.acquire()
+            queued = asyncio.ensure_future(admission.acquire(0))
+            await settle()
+            with pytest.raises(AdmissionRejected):
+                await admission.acquire(2)
+            queued.cancel()
+
+        run_sync(scenario())
+
+    def test_should_reject_call_waiting_longer_than_interval(self, run_sync):
+        admission = AdmissionController(max_concurrency=1, interval=0.01)
+
+        async def scenario():
+            await admission.acquire()
+            with pytest.raises(AdmissionRejected):
+                await admission.acquire()
+
+        run_sync(scenario())
+
+        assert admission.queue_depth == 0
+
+    def test_should_become_overloaded_with_standing_queue(self, run_sync):
+        admission = AdmissionController(
+            max_concurrency=1,
+            target_delay=0.001,
+            interval=0.01
+        )
+
+        async def scenario():
+            await admission.acquire()
+            for _ in range(2):
+                with pytest.raises(AdmissionRejected):
+                    await admission.acquire()
+
+        run_sync(scenario())
+
+        assert admission.overloaded
+        assert admission.rejected == 2
+
+    def _create_breaker(self, storage):
+        return circuit_breaker(
+            storage=storage,
+            failure_key='admission',
+            max_failures=2,
+            max_failure_exception=MyException,
+        )
+
+    def _reject_once(self, breaker, run_sync):
+        admission = AdmissionController(
+            max_concurrency=1,
+            max_queue=0,
+            breaker=breaker
+        )
+
+        async def scenario():
+            await admission.acquire()
+            with pytest.raises(AdmissionRejected):
+                await admission.acquire()
+
+        run_sync(scenario())
+
+    def test_should_count_rejection_as_breaker_failure(self, run_sync):
+        storage = create_storage_mock(failures=1)
+
+        self._reject_once(self._create_breaker(storage), run_sync)
+
+        storage.increment.assert_called_once_with('admission', 1)
+        assert not storage.get.called
+        assert not storage.set.called
+
+    def test_should_raise_rejection_when_breaker_opens(self, run_sync):
+        storage = create_storage_mock(failures=2)
+
+        self._reject_once(self._create_breaker(storage), run_sync)
+
+        storage.set.assert_called_once_with('circuit_admission', 1, None)
+
+    def test_should_raise_rejection_when_circuit_is_open(self, run_sync):
+        storage = create_storage_mock(is_circuit_open=True)
+
+        self._reject_once(self._create_breaker(storage), run_sync)
+
+        assert not storage.get.called
+
+    def test_should_not_accept_synchronous_breaker(self, memory):
+        breaker = CircuitBreaker(
+            storage=memory,
+            failure_key='admission',
+            max_failures=2,
+            max_failure_exception=MyException,
+        )
+
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrency=1, breaker=breaker)
+
+    def test_cancelled_waiter_should_leave_queue(self, run_sync):
+        admission = AdmissionController(max_concurrency=1, interval=1)
+
+        async def scenario():
+            await admission.acquire()
+            waiter = asyncio.ensure_future(admission.acquire())
+            await settle()
+            waiter.cancel()
+            await settle()
+            admission.release()
+
+        run_sync(scenario())
+
+        assert admission.queue_depth == 0
+        assert admission.active == 0
+        assert not any(admission._queues)
+
+    def test_expired_waiters_should_leave_queue_when_overloaded(
+        self,
+        run_sync
+    ):
+        admission = AdmissionController(
+            max_concurrency=1,
+            target_delay=0.001,
+            interval=1
+        )
+        admission.overloaded = True
+
+        async def call():
+            try:
+                await admission.acquire()
+            except AdmissionRejected:
+                pass
+
+        async def scenario():
+            await admission.acquire()
+            await asyncio.gather(*[call() for _ in range(20)])
+
+        run_sync(scenario())
+
+        assert admission.queue_depth == 0
+        assert not any(admission._queues)
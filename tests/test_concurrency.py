@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+from asyncio_toolkit.concurrency import bounded_map
+from asyncio_toolkit.deadline import DeadlineExceeded, deadline
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+def collect(run_sync, agen):
+    async def consume():
+        return [outcome async for outcome in agen]
+
+    return run_sync(consume())
+
+
+class TestBoundedMap:
+
+    @pytest.fixture
+    def breaker(self, memory):
+        return CircuitBreaker(
+            storage=memory,
+            failure_key='bounded_map',
+            max_failures=1,
+            max_failure_exception=MyException,
+        )
+
+    def test_should_yield_every_result(self, run_sync):
+        async def double(value):
+            return value * 2
+
+        outcomes = collect(run_sync, bounded_map(double, range(10), 3))
+
+        assert sorted(
+            (outcome.index, outcome.result) for outcome in outcomes
+        ) == [(i, i * 2) for i in range(10)]
+        assert all(outcome.exception is None for outcome in outcomes)
+
+    @pytest.mark.parametrize('limit', [0, -1])
+    def test_should_require_positive_limit(self, limit):
+        async def call(value):
+            return value
+
+        with pytest.raises(ValueError):
+            bounded_map(call, range(10), limit)
+
+    def test_should_limit_calls_in_flight(self, run_sync):
+        in_flight = []
+        peak = []
+
+        async def call(value):
+            in_flight.append(value)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(value)
+
+        collect(run_sync, bounded_map(call, range(20), 4))
+
+        assert max(peak) == 4
+
+    def test_should_yield_exceptions(self, run_sync):
+        async def fail(value):
+            raise ValueError(value)
+
+        outcomes = collect(run_sync, bounded_map(fail, range(3), 2))
+
+        assert all(
+            isinstance(outcome.exception, ValueError) for outcome in outcomes
+        )
+
+    def test_should_reject_remaining_items_when_circuit_opens(
+        self,
+        run_sync,
+        breaker
+    ):
+        called = []
+
+        async def call(value):
+            called.append(value)
+            if value == 2:
+                breaker.open_circuit()
+                raise MyException()
+            await asyncio.sleep(0)
+
+        outcomes = collect(run_sync, bounded_map(call, range(100), 2, breaker))
+
+        assert len(outcomes) == 100
+        assert len(called) < 5
+        rejected = [
+            outcome for outcome in outcomes
+            if isinstance(outcome.exception, MyException)
+        ]
+        assert len(rejected) == 100 - len(called) + 1
+
+    def test_should_keep_scheduling_when_circuit_is_closed(
+        self,
+        run_sync,
+        breaker
+    ):
+        async def call(value):
+            if value % 2:
+                raise MyException()
+            await asyncio.sleep(0)
+
+        outcomes = collect(run_sync, bounded_map(call, range(20), 2, breaker))
+
+        assert sum(outcome.exception is None for outcome in outcomes) == 10
+
+    def test_should_keep_scheduling_when_calls_are_shed(self, run_sync):
+        storage = create_storage_mock()
+        shedding = [True]
+        breaker = circuit_breaker(
+            storage=storage,
+            failure_key='bounded_map',
+            max_failures=1,
+            max_failure_exception=MyException,
+            shed_when=lambda: shedding[0],
+        )
+
+        @breaker
+        async def call(value):
+            return value
+
+        async def shed_once(value):
+            try:
+                return await call(value)
+            finally:
+                shedding[0] = False
+
+        outcomes = collect(
+            run_sync,
+            bounded_map(shed_once, range(10), 1, breaker)
+        )
+
+        assert isinstance(outcomes[0].exception, MyException)
+        assert [outcome.result for outcome in outcomes[1:]] == list(
+            range(1, 10)
+        )
+
+    def test_should_reject_remaining_items_after_deadline(self, run_sync):
+        async def call(value):
+            await asyncio.sleep(0.05)
+
+        async def consume():
+            with deadline(0.01):
+                return [
+                    outcome
+                    async for outcome in bounded_map(call, range(10), 2)
+                ]
+
+        outcomes = run_sync(consume())
+
+        assert len(outcomes) == 10
+        assert sum(
+            isinstance(outcome.exception, DeadlineExceeded)
+            for outcome in outcomes
+        ) == 8
@@ -0,0 +1,263 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit import deadline as deadline_module
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    deadline,
+    remaining,
+    wait_within_deadline
+)
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+class TestDeadline:
+
+    def test_remaining_without_deadline(self, run_sync):
+        async def fn():
+            return remaining()
+
+        assert run_sync(fn()) is None
+
+    def test_nested_deadline_cannot_extend_outer_one(self, run_sync):
+        async def fn():
+            with deadline(1) as outer:
+                with deadline(10) as inner:
+                    return outer, inner
+
+        outer, inner = run_sync(fn())
+
+        assert inner == outer
+
+    def test_deadline_is_reset_on_exit(self, run_sync):
+        async def fn():
+            with deadline(1):
+                pass
+            return remaining()
+
+        assert run_sync(fn()) is None
+
+    def test_check_deadline_raises_when_not_enough_time_left(self, run_sync):
+        async def fn():
+            with deadline(0.1):
+                check_deadline(0.5)
+
+        with pytest.raises(DeadlineExceeded):
+            run_sync(fn())
+
+    def test_wait_within_deadline_cancels_call(self, run_sync):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def fn():
+            with deadline(0.01):
+                await wait_within_deadline(slow())
+
+        with pytest.raises(DeadlineExceeded):
+            run_sync(fn())
+
+        assert cancelled
+
+
+class TestConcurrentDeadlines:
+
+    @pytest.fixture(params=['runtime', 'task_local'])
+    def deadline_storage(self, request):
+        if request.param == 'runtime':
+            yield
+            return
+
+        with mock.patch.object(
+            deadline_module,
+            '_deadline',
+            deadline_module._TaskLocalDeadline()
+        ):
+            yield
+
+    def test_tasks_should_not_share_deadlines(self, deadline_storage, run_sync):
+        async def handler(timeout, started, other_started):
+            with deadline(timeout):
+                started.set()
+                await other_started.wait()
+                left = remaining()
+            return left, remaining()
+
+        async def fn():
+            short_started = asyncio.Event()
+            long_started = asyncio.Event()
+            return await asyncio.gather(
+                handler(0.5, short_started, long_started),
+                handler(10, long_started, short_started),
+            )
+
+        (short_left, short_after), (long_left, long_after) = run_sync(fn())
+
+        assert short_left <= 0.5
+        assert long_left > 9
+        assert short_after is None
+        assert long_after is None
+
+    def test_interleaved_exits_should_not_leak_deadline(
+        self,
+        deadline_storage,
+        run_sync
+    ):
+        async def handler(timeout, exited):
+            with deadline(timeout):
+                await asyncio.sleep(timeout / 10)
+            exited.append(remaining())
+
+        async def fn():
+            exited = []
+            await asyncio.gather(
+                handler(0.2, exited),
+                handler(0.1, exited),
+            )
+            return exited, remaining()
+
+        exited, left = run_sync(fn())
+
+        assert exited == [None, None]
+        assert left is None
+
+    def test_nested_protected_calls_should_see_deadline(
+        self,
+        deadline_storage,
+        run_sync
+    ):
+        breaker = circuit_breaker(
+            storage=create_storage_mock(),
+            failure_key='deadline',
+            max_failures=10,
+            max_failure_exception=MyException,
+        )
+
+        @breaker
+        async def inner():
+            return remaining()
+
+        @breaker
+        async def outer():
+            return remaining(), await inner()
+
+        async def fn():
+            with deadline(5):
+                return await outer()
+
+        outer_left, inner_left = run_sync(fn())
+
+        assert 4 < inner_left <= outer_left < 5
+
+    def test_inherited_deadline_should_be_dropped_with_task(
+        self,
+        deadline_storage,
+        run_sync
+    ):
+        async def fn():
+            with deadline(5):
+                return await wait_within_deadline(asyncio.sleep(0, 'done'))
+
+        assert run_sync(fn()) == 'done'
+        if isinstance(
+            deadline_module._deadline,
+            deadline_module._TaskLocalDeadline
+        ):
+            assert not deadline_module._deadline._deadlines
+
+
+class TestCircuitBreakerDeadline:
+
+    @pytest.fixture
+    def storage(self):
+        return create_storage_mock()
+
+    def _create_breaker(self, storage):
+        return circuit_breaker(
+            storage=storage,
+            failure_key='deadline',
+            max_failures=10,
+            max_failure_exception=MyException,
+            catch_exceptions=(DeadlineExceeded,),
+            min_deadline_remaining=0.05,
+        )
+
+    def test_should_fail_fast_without_touching_storage(
+        self,
+        storage,
+        run_sync
+    ):
+        @self._create_breaker(storage)
+        async def call():
+            return True
+
+        async def fn():
+            with deadline(0.01):
+                await call()
+
+        with pytest.raises(DeadlineExceeded):
+            run_sync(fn())
+
+        assert not storage.get.called
+        assert not storage.increment.called
+
+    def test_should_cancel_call_at_deadline_and_count_failure(
+        self,
+        storage,
+        run_sync
+    ):
+        @self._create_breaker(storage)
+        async def call():
+            await asyncio.sleep(10)
+
+        async def fn():
+            with deadline(0.1):
+                await call()
+
+        with pytest.raises(DeadlineExceeded):
+            run_sync(fn())
+
+        storage.increment.assert_called_once_with('deadline', 1)
+
+    def test_context_manager_should_cancel_block_at_deadline(
+        self,
+        storage,
+        run_sync
+    ):
+        breaker = self._create_breaker(storage)
+
+        async def fn():
+            with deadline(0.1):
+                async with breaker:
+                    await asyncio.sleep(10)
+
+        with pytest.raises(DeadlineExceeded):
+            run_sync(fn())
+
+        storage.increment.assert_called_once_with('deadline', 1)
+
+    def test_context_manager_should_stop_timer_on_exit(
+        self,
+        storage,
+        run_sync
+    ):
+        breaker = self._create_breaker(storage)
+
+        async def fn():
+            with deadline(0.1):
+                async with breaker:
+                    pass
+                await asyncio.sleep(0.2)
+            return True
+
+        assert run_sync(fn())
+        assert not breaker._deadline_timers
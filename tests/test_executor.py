@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.executor import BoundedExecutor
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+class TestBoundedExecutor:
+
+    @pytest.fixture
+    def executor(self):
+        executor = BoundedExecutor(max_workers=1)
+        yield executor
+        executor.shutdown()
+
+    def test_should_track_queue_depth_and_running_calls(self, executor):
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(1)
+
+        running = executor.submit(block)
+        queued = executor.submit(block)
+        started.wait(1)
+
+        assert executor.running == 1
+        assert executor.queue_depth == 1
+
+        release.set()
+        running.result(1)
+        queued.result(1)
+
+        assert executor.running == 0
+        assert executor.queue_depth == 0
+
+    def test_cancelled_call_should_leave_queue(self, executor):
+        release = threading.Event()
+        running = executor.submit(release.wait, 1)
+        queued = executor.submit(time.sleep, 0)
+
+        assert queued.cancel()
+        assert executor.queue_depth == 0
+
+        release.set()
+        running.result(1)
+
+
+class TestCircuitBreakerExecutor:
+
+    @pytest.fixture
+    def executor(self):
+        executor = BoundedExecutor(max_workers=2)
+        yield executor
+        executor.shutdown()
+
+    def _create_breaker(self, storage, executor):
+        return circuit_breaker(
+            storage=storage,
+            failure_key='executor',
+            max_failures=10,
+            max_failure_exception=MyException,
+            catch_exceptions=(ValueError,),
+            executor=executor,
+        )
+
+    def test_should_run_blocking_function_on_executor(
+        self,
+        executor,
+        run_sync
+    ):
+        @self._create_breaker(create_storage_mock(), executor)
+        def call(value):
+            return value, threading.current_thread()
+
+        value, thread = run_sync(call(1))
+
+        assert value == 1
+        assert thread is not threading.current_thread()
+
+    def test_should_count_failures_on_loop(self, executor, run_sync):
+        storage = create_storage_mock()
+
+        @self._create_breaker(storage, executor)
+        def call():
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            run_sync(call())
+
+        storage.increment.assert_called_once_with('executor', 1)
+
+    def test_should_not_take_thread_when_circuit_is_open(
+        self,
+        executor,
+        run_sync
+    ):
+        called = []
+
+        @self._create_breaker(
+            create_storage_mock(is_circuit_open=True),
+            executor
+        )
+        def call():
+            called.append(True)
+
+        with pytest.raises(MyException):
+            run_sync(call())
+
+        assert not called
+        assert executor.queue_depth == 0
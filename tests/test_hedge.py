@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.circuit_breaker.context_manager import CircuitBreaker
+from asyncio_toolkit.hedge import hedge
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+def create_backend(latencies):
+    calls = []
+
+    async def backend():
+        latency = latencies[len(calls)]
+        calls.append(latency)
+        await asyncio.sleep(abs(latency))
+        if latency < 0:
+            raise ValueError()
+        return latency
+
+    return backend, calls
+
+
+class TestHedge:
+
+    def test_should_not_hedge_fast_calls(self, run_sync):
+        backend, calls = create_backend([0, 0])
+        hedged = hedge(delay=0.05)
+
+        assert run_sync(hedged(backend)()) == 0
+        assert calls == [0]
+        assert hedged.hedged == 0
+
+    def test_should_return_first_success(self, run_sync):
+        backend, calls = create_backend([0.5, 0.01])
+        hedged = hedge(delay=0.01)
+
+        assert run_sync(hedged(backend)()) == 0.01
+        assert hedged.hedged == 1
+
+    def test_should_cancel_loser(self, run_sync):
+        cancelled = []
+
+        async def backend():
+            try:
+                await asyncio.sleep(0.5 if not cancelled else 0)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        run_sync(hedge(delay=0.01)(backend)())
+        run_sync(asyncio.sleep(0))
+
+        assert cancelled == [True]
+
+    def test_should_respect_budget(self, run_sync):
+        backend, calls = create_backend([0.03, 0.03])
+        hedged = hedge(delay=0.01, budget=0, max_tokens=0)
+
+        run_sync(hedged(backend)())
+
+        assert len(calls) == 1
+        assert hedged.hedged == 0
+
+    def test_should_raise_error_when_every_attempt_fails(self, run_sync):
+        backend, calls = create_backend([-0.03, -0.01])
+
+        with pytest.raises(ValueError):
+            run_sync(hedge(delay=0.01)(backend)())
+
+        assert len(calls) == 2
+
+    def test_should_retrieve_exceptions_of_losing_attempts(self, run_sync):
+        class Attempt(asyncio.Future):
+            retrieved = False
+
+            def __init__(self, order):
+                super().__init__()
+                self.order = order
+
+            def __hash__(self):
+                # The successful attempt comes first in the done set
+                return self.order
+
+            def exception(self):
+                self.retrieved = True
+                return super().exception()
+
+        async def scenario():
+            attempts = [Attempt(order) for order in range(10)]
+            attempts[0].set_result('result')
+            for attempt in attempts[1:]:
+                attempt.set_exception(ValueError())
+            return await hedge()._first_success(attempts), attempts
+
+        result, attempts = run_sync(scenario())
+
+        assert result == 'result'
+        assert all(attempt.retrieved for attempt in attempts[1:])
+
+    def test_should_not_accept_synchronous_breaker(self, memory):
+        breaker = CircuitBreaker(
+            storage=memory,
+            failure_key='hedge',
+            max_failures=1,
+            max_failure_exception=MyException,
+        )
+
+        with pytest.raises(ValueError):
+            hedge(delay=0.01, breaker=breaker)
+
+    def test_should_use_observed_percentile_as_delay(self, run_sync):
+        backend, calls = create_backend([0] * 5)
+        hedged = hedge(delay=1, percentile=50, min_samples=5)
+
+        assert hedged.hedge_delay == 1
+        for _ in range(5):
+            run_sync(hedged(backend)())
+
+        assert hedged.hedge_delay < 1
+
+    def test_should_not_hedge_while_circuit_is_open(self, run_sync):
+        backend, calls = create_backend([0.03, 0.03])
+        breaker = circuit_breaker(
+            storage=create_storage_mock(is_circuit_open=True),
+            failure_key='hedge',
+            max_failures=10,
+            max_failure_exception=MyException,
+        )
+
+        run_sync(hedge(delay=0.01, breaker=breaker)(backend)())
+
+        assert len(calls) == 1
+
+    def test_cancelled_loser_should_not_count_as_failure(self, run_sync):
+        storage = create_storage_mock()
+        backend, calls = create_backend([0.5, 0.01])
+        breaker = circuit_breaker(
+            storage=storage,
+            failure_key='hedge',
+            max_failures=10,
+            max_failure_exception=MyException,
+            catch_exceptions=(asyncio.CancelledError,),
+        )
+
+        result = run_sync(hedge(delay=0.01, breaker=breaker)(
+            breaker(backend)
+        )())
+        run_sync(asyncio.sleep(0))
+
+        assert result == 0.01
+        assert not storage.increment.called
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from asyncio_toolkit.circuit_breaker.async_await import circuit_breaker
+from asyncio_toolkit.loop_monitor import LoopLagMonitor
+from tests.circuit_breaker.helpers import MyException, create_storage_mock
+
+
+class TestLoopLagMonitor:
+
+    @pytest.fixture
+    def monitor(self, loop):
+        monitor = LoopLagMonitor(interval=0.01, loop=loop)
+        yield monitor
+        monitor.stop()
+
+    def test_should_measure_blocked_loop(self, monitor, run_sync):
+        async def block():
+            await asyncio.sleep(0.005)
+            time.sleep(0.05)
+            await asyncio.sleep(0.02)
+
+        monitor.start()
+        run_sync(block())
+
+        assert monitor.percentile(100) >= 0.03
+        assert monitor.is_lagging(0.03, percentile=100)
+        assert not monitor.is_lagging(1)
+
+    def test_should_call_callbacks_with_lag(self, monitor, run_sync):
+        callback = mock.Mock()
+        monitor.add_callback(callback)
+
+        monitor.start()
+        run_sync(asyncio.sleep(0.05))
+
+        assert callback.called
+        assert callback.call_args[0][0] >= 0
+
+    def test_stop(self, monitor):
+        monitor.start()
+        monitor.stop()
+
+        assert not monitor.is_running
+
+    def test_should_not_lag_after_stop(self, monitor, run_sync):
+        async def block():
+            await asyncio.sleep(0.005)
+            time.sleep(0.05)
+            await asyncio.sleep(0.02)
+
+        monitor.start()
+        run_sync(block())
+        monitor.stop()
+
+        assert not monitor.lagging(0.03)()
+        assert not monitor.is_lagging(0.03, percentile=99)
+
+    def test_should_not_lag_without_samples(self, monitor):
+        assert not monitor.is_lagging(0)
+        assert not monitor.is_lagging(0, percentile=99)
+
+    def test_breaker_should_shed_calls_while_lagging(
+        self,
+        monitor,
+        run_sync
+    ):
+        storage = create_storage_mock()
+        monitor.lag = 1
+
+        @circuit_breaker(
+            storage=storage,
+            failure_key='lag',
+            max_failures=10,
+            max_failure_exception=MyException,
+            shed_when=monitor.lagging(0.5),
+        )
+        async def call():
+            return True
+
+        with pytest.raises(MyException):
+            run_sync(call())
+
+        assert not storage.get.called
+
+        monitor.lag = 0.1
+        assert run_sync(call())
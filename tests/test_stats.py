@@ -0,0 +1,25 @@
+from asyncio_toolkit.stats import SlidingWindow
+
+
+class TestSlidingWindow:
+
+    def test_percentile_without_samples(self):
+        assert SlidingWindow().percentile(99) is None
+
+    def test_percentile(self):
+        window = SlidingWindow()
+        for value in range(1, 101):
+            window.add(value)
+
+        assert window.percentile(50) == 50
+        assert window.percentile(99) == 99
+        assert window.percentile(100) == 100
+        assert window.percentile(0) == 1
+
+    def test_should_keep_last_samples_only(self):
+        window = SlidingWindow(size=2)
+        for value in (10, 1, 2):
+            window.add(value)
+
+        assert len(window) == 2
+        assert window.percentile(100) == 2